@@ -2,36 +2,111 @@ from __future__ import annotations
 
 import asyncio
 import functools
+import logging
+import os
+import random
+import threading
 import time
 
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, TypeVar, ParamSpec, Coroutine, Callable, Literal, Optional, Dict
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Any, Awaitable, Callable, Literal, Optional, Dict
 
-from pybit.unified_trading import HTTP
+import aiohttp
 
-from .common import Kline, Singleton
+from .bybit_http import BybitHTTP
+from .common import Kline, KlineBatch
 from ..logger import get_app_logger
 
 logger = get_app_logger()
 
+# Одновременных запросов свечей в gather_klines (поверх token-bucket категории market)
+KLINES_CONCURRENCY = 10
+
+# Одновременных запросов в batch-методах по символам (get_positions_batch)
+REST_FANOUT_CONCURRENCY = 20
+
+# retCode, которые не исправятся повтором: auth, параметры, qty, плечо уже выставлено
+NON_RETRYABLE = frozenset({10001, 10003, 10004, 10005, 110007, 110043})
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+
+class BybitAPIError(Exception):
+    """Ответ Bybit с retCode != 0"""
+
+    def __init__(self, ret_code: int, ret_msg: str = ""):
+        super().__init__(f"({ret_code}) {ret_msg}")
+        self.ret_code = ret_code
+        self.ret_msg = ret_msg
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Экспоненциальная задержка с jitter ±50%: повторы разных задач не синхронизируются"""
+    return min(base * 2 ** attempt, cap) * random.uniform(0.5, 1.5)
+
+
+def retry(attempts: int = RETRY_ATTEMPTS, delay: float = RETRY_BASE_DELAY):
+    """
+    Повтор async вызова с экспоненциальной задержкой и jitter
+
+    Повторяются сетевые ошибки, таймауты и BybitAPIError вне NON_RETRYABLE;
+    остальные исключения пробрасываются сразу.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except BybitAPIError as e:
+                    if e.ret_code in NON_RETRYABLE or attempt == attempts - 1:
+                        raise
+                    error = e
+                except (TimeoutError, aiohttp.ClientError) as e:
+                    if attempt == attempts - 1:
+                        raise
+                    error = e
+                pause = backoff_delay(attempt, delay)
+                logger.warning(
+                    "%s failed (%s), retry %s/%s in %.2fs",
+                    func.__name__, error, attempt + 1, attempts - 1, pause,
+                )
+                await asyncio.sleep(pause)
+        return wrapper
+    return decorator
+
 
-P = ParamSpec("P")
-R = TypeVar("R")
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
 
 
-def async_wrap(func: Callable[P, R]) -> Callable[P, Coroutine[Any, Any, R]]:
-    """Декоратор для async выполнения sync функций"""
-    @functools.wraps(func)
-    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-        self = args[0]
-        loop = asyncio.get_running_loop()
-        partial_func = functools.partial(func, *args, **kwargs)
-        return await loop.run_in_executor(self._executor, partial_func)
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Общий на процесс пул потоков (DNS-резолвер aiohttp, asyncio.to_thread)
 
-    return wrapper
+    Размер берётся из BYBIT_THREAD_POOL_SIZE, по умолчанию min(32, cpu + 4).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                size = int(os.getenv("BYBIT_THREAD_POOL_SIZE", 0)) or min(32, (os.cpu_count() or 1) + 4)
+                _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="bybit")
+    return _executor
 
 
-class BybitClient(metaclass=Singleton):
+class BybitClient:
+
+    __slots__ = (
+        "api_key", "api_secret", "testnet", "demo", "session", "_initialized",
+        "request_count", "error_count", "last_request_time",
+        "_instrument_cache", "_inflight", "_instrument_ttl_sec",
+        "_balance_cache", "_position_cache", "_account_ttl_sec", "_account_generation",
+        "_klines_semaphore", "_fanout_semaphore", "_tickers_cache", "_tickers_ttl_sec",
+        "_ticker_cache",
+    )
 
     def __init__(self, api_key: str, api_secret: str, testnet: bool = True, demo: bool = False):
         self.api_key: str = api_key
@@ -39,25 +114,39 @@ class BybitClient(metaclass=Singleton):
         self.testnet: bool = testnet
         self.demo: bool = demo
 
-        self.session: HTTP | None = None
+        self.session: BybitHTTP | None = None
 
-        self._executor = ThreadPoolExecutor(max_workers=10)
         self._initialized: bool = False
 
         self.request_count = 0
         self.error_count = 0
         self.last_request_time = 0
 
-        # cache for instruments info
-        self._instrument_cache: Dict[str, Dict[str, Any]] = {}
-        self._instrument_cache_ts: Dict[str, float] = {}
+        # cache for instruments info: key -> (monotonic ts, spec); single-flight по ключу
+        self._instrument_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        self._inflight: Dict[Any, asyncio.Future] = {}
         self._instrument_ttl_sec: int = 300
 
-        logger.info(f"BybitClient initialized. Testnet: {testnet}")
+        # micro-cache for account state; invalidated by orders / leverage changes
+        self._balance_cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        self._position_cache: Dict[tuple[str, str], tuple[float, Dict[str, Any]]] = {}
+        self._account_ttl_sec: float = 0.75
+        self._account_generation: int = 0
+
+        self._klines_semaphore = asyncio.Semaphore(KLINES_CONCURRENCY)
+        self._fanout_semaphore = asyncio.Semaphore(REST_FANOUT_CONCURRENCY)
+
+        # coalescing cache for full-category tickers: category -> (ts, {symbol: ticker})
+        self._tickers_cache: Dict[str, tuple[float, Dict[str, Dict[str, Any]]]] = {}
+        self._tickers_ttl_sec: float = 0.5
+        # same TTL for single-symbol tickers: (category, symbol) -> (ts, ticker)
+        self._ticker_cache: Dict[tuple[str, str], tuple[float, Dict[str, Any]]] = {}
+
+        logger.info("BybitClient initialized. Testnet: %s", testnet)
 
     def _init_session(self):
         if self.session is None:
-            self.session = HTTP(
+            self.session = BybitHTTP(
                 testnet=self.testnet,
                 api_key=self.api_key,
                 api_secret=self.api_secret,
@@ -65,129 +154,346 @@ class BybitClient(metaclass=Singleton):
             )
             self._initialized = True
 
-    @async_wrap
-    def get_klines(
+    async def start(self) -> None:
+        """Общий пул потоков как executor по умолчанию, прогрев и keep-alive пинг REST сессии"""
+        asyncio.get_running_loop().set_default_executor(_get_executor())
+        self._init_session()
+        await self.session.prewarm()
+        self.session.start_keepalive()
+
+    async def _single_flight(
+            self,
+            cache: Dict[Any, tuple[float, Any]],
+            key: Any,
+            ttl: float,
+            fetch: Callable[[], Awaitable[Any]],
+            generation: Callable[[], int] | None = None,
+    ) -> Any:
+        """
+        TTL-кэш с single-flight: параллельные промахи по одному ключу ждут один запрос
+
+        None не кэшируется. Если generation() изменился за время запроса
+        (кэш инвалидирован), результат отдаётся, но в кэш не кладётся.
+        """
+        cached = cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+
+        inflight_key = (id(cache), key)
+        inflight = self._inflight.get(inflight_key)
+        if inflight is None:
+            async def run() -> Any:
+                started = generation() if generation else None
+                result = await fetch()
+                if result is not None and (generation is None or generation() == started):
+                    cache[key] = (time.monotonic(), result)
+                return result
+
+            inflight = asyncio.ensure_future(run())
+            self._inflight[inflight_key] = inflight
+            inflight.add_done_callback(lambda done: self._drop_inflight(inflight_key, done))
+
+        # shield: отмена одного ожидающего не отменяет общий запрос
+        return await asyncio.shield(inflight)
+
+    def _drop_inflight(self, inflight_key: tuple, future: asyncio.Future) -> None:
+        """Снять завершённый запрос, если ключ не занят уже новым (после инвалидации)"""
+        if self._inflight.get(inflight_key) is future:
+            del self._inflight[inflight_key]
+
+    @retry()
+    async def _call(self, method: Callable[..., Awaitable[dict[str, Any]]], **params) -> dict[str, Any]:
+        """
+        Вызов метода сессии с retry
+
+        Raises:
+            BybitAPIError: retCode != 0 (после повторов, если код повторяемый)
+        """
+        response = await method(**params)
+        ret_code = response.get("retCode", 0)
+        if ret_code != 0:
+            raise BybitAPIError(ret_code, response.get("retMsg", ""))
+        return response
+
+    def _invalidate_account_cache(self) -> None:
+        """Сброс кэша баланса/позиций после изменения состояния аккаунта"""
+        self._account_generation += 1
+        self._balance_cache.clear()
+        self._position_cache.clear()
+        for key in [k for k in self._inflight if k[0] in (id(self._balance_cache), id(self._position_cache))]:
+            self._inflight.pop(key, None)
+
+    async def get_klines(
             self,
             category: str,
             symbol: str,
             interval: str,
             limit: int = 200
-    ) -> list[Kline]:
+    ) -> KlineBatch | list[Kline]:
         """
         Получение исторических свечей (klines)
+
+        Возвращает KlineBatch в хронологическом порядке; при ошибке — [].
         """
         self._init_session()
 
         try:
-            response = self.session.get_kline(
+            response = await self._call(
+                self.session.get_kline,
                 category=category,
                 symbol=symbol,
                 interval=interval,
                 limit=limit
             )
 
-            if response['retCode'] == 0:
-                klines = response["result"]["list"]
-                result = []
-                for kline in klines:
-                    result.append(Kline(
-                        timestamp=int(kline[0]),
-                        open=float(kline[1]),
-                        high=float(kline[2]),
-                        low=float(kline[3]),
-                        close=float(kline[4]),
-                        volume=float(kline[5]),
-                        confirm=False,
-                    ))
-                result.reverse()
-                logger.info(f"Loaded {len(result)} klines for {symbol} ({interval})")
-                return result
+            result = KlineBatch.from_bybit(response["result"]["list"])
+            logger.info("Loaded %s klines for %s (%s)", len(result), symbol, interval)
+            return result
 
-            logger.error(f"Get klines error: {response.get('retMsg')}")
+        except BybitAPIError as e:
+            logger.error("Get klines error: %s", e.ret_msg)
             return []
 
         except Exception as e:
-            logger.error(f"Exception getting klines: {e}")
+            logger.error("Exception getting klines: %s", e)
             return []
 
-    @async_wrap
-    def get_ticker(self, category: str, symbol: str) -> dict[str, Any] | None:
-        """Получение текущего тикера (для sub-minute polling)"""
+    async def gather_klines(
+            self,
+            targets: list[tuple[str, str]],
+            interval: str,
+            limit: int = 200
+    ) -> list[KlineBatch | list[Kline]]:
+        """
+        Параллельная загрузка свечей для списка (category, symbol)
+
+        Одновременно выполняется не больше KLINES_CONCURRENCY запросов.
+        Результаты в порядке targets; при ошибке по паре — [].
+        """
+        async def load(category: str, symbol: str) -> KlineBatch | list[Kline]:
+            async with self._klines_semaphore:
+                return await self.get_klines(category, symbol, interval, limit)
+
+        return list(await asyncio.gather(*(load(c, s) for c, s in targets)))
+
+    async def get_ticker(self, category: str, symbol: str) -> dict[str, Any] | None:
+        """
+        Получение текущего тикера (для sub-minute polling)
+
+        Одновременные опросы одной пары (циклы разных frame на одном тике)
+        ждут один запрос и делят ответ на _tickers_ttl_sec. Ошибка запроса
+        логируется, возвращается None.
+        """
         self._init_session()
 
         try:
-            self.request_count += 1
-            self.last_request_time = time.time()
+            return await self._cached_ticker(category, symbol)
+        except Exception as e:
+            logger.error("Exception getting ticker for %s: %s", symbol, e)
+            return None
 
-            response = self.session.get_tickers(category=category, symbol=symbol)
+    async def _cached_ticker(self, category: str, symbol: str) -> dict[str, Any] | None:
+        return await self._single_flight(
+            self._ticker_cache,
+            (category, symbol),
+            self._tickers_ttl_sec,
+            lambda: self._fetch_ticker(category, symbol),
+        )
 
-            if response["retCode"] == 0:
-                tickers = response.get('result', {}).get('list', [])
-                if tickers:
-                    ticker = tickers[0]
-                    logger.debug(
-                        f"Got ticker for {symbol}: "
-                        f"${ticker.get('lastPrice')} "
-                        f"(high: ${ticker.get('highPrice24h')}, "
-                        f"low: ${ticker.get('lowPrice24h')})"
-                    )
-                    return ticker
-
-                logger.warning(f"No ticker data for {symbol}")
-                return None
-
-            else:
-                logger.error(
-                    f"Get ticker error for {symbol}: "
-                    f"({response.get('retCode')}) {response.get('retMsg')}"
+    async def _fetch_ticker(self, category: str, symbol: str) -> dict[str, Any] | None:
+        """
+        Raises:
+            BybitAPIError: retCode != 0
+        """
+        self.request_count += 1
+        self.last_request_time = time.time()
+
+        try:
+            response = await self.session.get_tickers(category=category, symbol=symbol)
+        except Exception:
+            self.error_count += 1
+            raise
+
+        if response["retCode"] != 0:
+            raise BybitAPIError(response["retCode"], response.get("retMsg", ""))
+
+        tickers = response.get('result', {}).get('list', [])
+        if tickers:
+            ticker = tickers[0]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Got ticker for %s: $%s (high: $%s, low: $%s)",
+                    symbol,
+                    ticker.get('lastPrice'),
+                    ticker.get('highPrice24h'),
+                    ticker.get('lowPrice24h'),
                 )
-                return None
+            return ticker
 
-        except Exception as e:
+        logger.warning("No ticker data for %s", symbol)
+        return None
+
+    async def get_tickers_batch(self, category: str, symbols: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Тикеры нескольких пар одной категории за один запрос
+
+        Без symbol Bybit отдаёт всю категорию. Ответ кэшируется на
+        _tickers_ttl_sec, чтобы опросы одного тика разделяли один запрос.
+        Для одной пары без свежего кэша запрашивается только она,
+        для category=option — каждая пара отдельно (параллельно).
+
+        Raises:
+            BybitAPIError / ошибка транспорта: запрос не удался — polling цикл
+            отличает это от пустого ответа и уходит в backoff
+        """
+        self._init_session()
+
+        cached = self._tickers_cache.get(category)
+        if cached is None or time.monotonic() - cached[0] >= self._tickers_ttl_sec:
+            if len(symbols) == 1:
+                ticker = await self._cached_ticker(category, symbols[0])
+                return {symbols[0]: ticker} if ticker else {}
+
+            if category == "option":
+                # option без baseCoin/symbol не отдаётся списком: запрос на каждую пару
+                tickers = await self._fan_out(
+                    [functools.partial(self._cached_ticker, category, s) for s in symbols]
+                )
+                return {s: t for s, t in zip(symbols, tickers) if t}
+
+        # Параллельные промахи по категории ждут один общий запрос
+        by_symbol = await self._single_flight(
+            self._tickers_cache,
+            category,
+            self._tickers_ttl_sec,
+            lambda: self._fetch_tickers(category),
+        )
+        if not by_symbol:
+            return {}
+        return {s: by_symbol[s] for s in symbols if s in by_symbol}
+
+    async def _fetch_tickers(self, category: str) -> dict[str, dict[str, Any]]:
+        """
+        Raises:
+            BybitAPIError: retCode != 0
+        """
+        self.request_count += 1
+        self.last_request_time = time.time()
+
+        try:
+            response = await self.session.get_tickers(category=category)
+        except Exception:
             self.error_count += 1
-            logger.error(f"Exception getting ticker for {symbol}: {e}", exc_info=True)
-            return None
+            raise
+
+        if response["retCode"] != 0:
+            raise BybitAPIError(response["retCode"], response.get("retMsg", ""))
+
+        return {t["symbol"]: t for t in response.get("result", {}).get("list", [])}
 
-    @async_wrap
-    def set_leverage(self, category: str, symbol: str, leverage: int) -> bool:
+    async def get_ticker_prices(self, category: str, symbols: list[str]) -> dict[str, float]:
+        """lastPrice нескольких пар одной категории (один запрос через get_tickers_batch)"""
+        tickers = await self.get_tickers_batch(category, symbols)
+        return {s: float(t["lastPrice"]) for s, t in tickers.items() if t.get("lastPrice")}
+
+    async def _fan_out(self, calls: list[Callable[[], Awaitable[Any]]]) -> list[Any]:
+        """Параллельный запуск вызовов, не больше REST_FANOUT_CONCURRENCY одновременно"""
+        async def bounded(call: Callable[[], Awaitable[Any]]) -> Any:
+            async with self._fanout_semaphore:
+                return await call()
+
+        return list(await asyncio.gather(*(bounded(c) for c in calls)))
+
+    async def get_positions_batch(self, category: str, symbols: list[str]) -> dict[str, dict[str, Any] | None]:
+        """Позиции по списку символов; None — позиции нет или ошибка запроса"""
+        positions = await self._fan_out(
+            [functools.partial(self.get_position, category, s) for s in symbols]
+        )
+        return dict(zip(symbols, positions))
+
+    async def set_leverage(self, category: str, symbol: str, leverage: int) -> bool:
         """Установка плеча с retry"""
         self._init_session()
 
+        params = self._build_leverage_params(category, symbol, leverage)
+
         try:
             self.request_count += 1
-            lev = str(leverage)
 
-            response = self.session.set_leverage(
-                category=category,
-                symbol=symbol,
-                buyLeverage=lev,
-                sellLeverage=lev,
-            )
+            await self._call(self.session.set_leverage, **params)
 
-            ret_code = response.get("retCode", 0)
+            self._invalidate_account_cache()
+            logger.info("✓ Leverage set for %s: %sx", symbol, leverage)
+            return True
 
-            if ret_code == 0:
-                logger.info(f"✓ Leverage set for {symbol}: {leverage}x")
+        except BybitAPIError as e:
+            if e.ret_code == 110043:
+                logger.debug("Leverage already set or not applicable for %s", symbol)
                 return True
 
-            elif ret_code == 110043:
-                logger.debug(f"Leverage already set or not applicable for {symbol}")
-                return True
-
-            else:
-                logger.error(
-                    f"✗ Set leverage error for {symbol} "
-                    f"(code {ret_code}): {response.get('retMsg')}"
-                )
-                return False
+            logger.error(
+                "✗ Set leverage error for %s (code %s): %s",
+                symbol, e.ret_code, e.ret_msg,
+            )
+            return False
 
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Exception setting leverage for {symbol}: {e}")
+            logger.error("Exception setting leverage for %s: %s", symbol, e)
             return False
 
-    @async_wrap
-    def place_market_order(
+    @staticmethod
+    def _build_leverage_params(category: str, symbol: str, leverage: int) -> dict[str, Any]:
+        """Параметры /v5/position/set-leverage (одно плечо на обе стороны)"""
+        lev = str(leverage)
+        return {
+            "category": category,
+            "symbol": symbol,
+            "buyLeverage": lev,
+            "sellLeverage": lev,
+        }
+
+    @staticmethod
+    def _build_order_params(
+            category: str,
+            symbol: str,
+            side: Literal["Buy", "Sell"],
+            qty: str,
+            take_profit: str | None = None,
+            stop_loss: str | None = None,
+            position_idx: int = 0
+    ) -> dict[str, Any]:
+        """
+        Параметры рыночного ордера без сетевых вызовов
+
+        Raises:
+            ValueError: qty пустое, нечисловое или <= 0
+        """
+        if not qty or float(qty) <= 0:
+            raise ValueError(f"Invalid quantity: {qty}")
+
+        params = {
+            "category": category,
+            "symbol": symbol,
+            "side": side,
+            "orderType": "Market",
+            "qty": qty,
+            "positionIdx": position_idx
+        }
+
+        if take_profit:
+            params["takeProfit"] = take_profit
+        else:
+            logger.warning("Market order without take profit for %s", symbol)
+
+        if stop_loss:
+            params["stopLoss"] = stop_loss
+        else:
+            logger.warning("Market order without stop loss for %s", symbol)
+
+        return params
+
+    async def place_market_order(
             self,
             category: str,
             symbol: str,
@@ -201,78 +507,71 @@ class BybitClient(metaclass=Singleton):
         self._init_session()
 
         try:
-            if not qty or float(qty) <= 0:
-                logger.error(f"Invalid quantity for {symbol}: {qty}")
-                return None
+            params = self._build_order_params(
+                category, symbol, side, qty, take_profit, stop_loss, position_idx
+            )
+        except ValueError:
+            logger.error("Invalid quantity for %s: %s", symbol, qty)
+            return None
 
+        try:
             self.request_count += 1
 
-            params = {
-                "category": category,
-                "symbol": symbol,
-                "side": side,
-                "orderType": "Market",
-                "qty": qty,
-                "positionIdx": position_idx
-            }
-
-            if take_profit:
-                params["takeProfit"] = take_profit
-            else:
-                logger.warning(f"Market order without take profit for {symbol}")
-
-            if stop_loss:
-                params["stopLoss"] = stop_loss
-            else:
-                logger.warning(f"Market order without stop loss for {symbol}")
-
-            response = self.session.place_order(**params)
+            response = await self.session.place_order(**params)
 
             if response["retCode"] == 0:
+                self._invalidate_account_cache()
                 result = response["result"]
-                logger.info(f"✅ Order placed: {side} {qty} {symbol}")
-                logger.debug(f"  Order ID: {result.get('orderId')}")
+                logger.info("✅ Order placed: %s %s %s", side, qty, symbol)
+                logger.debug("  Order ID: %s", result.get('orderId'))
                 if take_profit:
-                    logger.debug(f"  TP: {take_profit}")
+                    logger.debug("  TP: %s", take_profit)
                 if stop_loss:
-                    logger.debug(f"  SL: {stop_loss}")
+                    logger.debug("  SL: %s", stop_loss)
                 return result
 
-            logger.error(f"❌ Place order error: {response.get('retMsg')}")
+            logger.error("❌ Place order error: %s", response.get('retMsg'))
             return None
 
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Exception placing order for {symbol}: {e}")
+            logger.error("Exception placing order for %s: %s", symbol, e)
             return None
 
-    @async_wrap
-    def get_position(self, category: str, symbol: str) -> dict[str, Any] | None:
-        """Получение позиции"""
+    async def get_position(self, category: str, symbol: str) -> dict[str, Any] | None:
+        """Получение позиции (кэш _account_ttl_sec, сбрасывается ордером/плечом)"""
         self._init_session()
 
+        return await self._single_flight(
+            self._position_cache,
+            (category, symbol),
+            self._account_ttl_sec,
+            lambda: self._fetch_position(category, symbol),
+            lambda: self._account_generation,
+        )
+
+    async def _fetch_position(self, category: str, symbol: str) -> dict[str, Any] | None:
         try:
             self.request_count += 1
 
-            response = self.session.get_positions(
+            response = await self._call(
+                self.session.get_positions,
                 category=category,
                 symbol=symbol
             )
 
-            if response["retCode"] == 0 and response["result"]["list"]:
-                for pos in response["result"]["list"]:
-                    if float(pos.get("size", 0)) > 0:
-                        return pos
+            for pos in response["result"]["list"]:
+                if float(pos.get("size", 0)) > 0:
+                    return pos
 
             return None
 
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Exception getting position {symbol}: {e}")
+            logger.error("Exception getting position %s: %s", symbol, e)
             return None
 
-    @async_wrap
-    def get_order_history(
+    async def get_order_history(
             self,
             category: str,
             symbol: str | None = None,
@@ -292,78 +591,84 @@ class BybitClient(metaclass=Singleton):
             if symbol:
                 params["symbol"] = symbol
 
-            response = self.session.get_order_history(**params)
+            response = await self._call(self.session.get_order_history, **params)
 
-            if response["retCode"] == 0:
-                return response["result"]["list"]
-
-            return []
+            return response["result"]["list"]
 
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Exception getting order history: {e}")
+            logger.error("Exception getting order history: %s", e)
             return []
 
-    @async_wrap
-    def get_wallet_balance(self, account_type: str = "UNIFIED") -> dict[str, Any] | None:
-        """Получение баланса кошелька"""
+    async def get_wallet_balance(self, account_type: str = "UNIFIED") -> dict[str, Any] | None:
+        """Получение баланса кошелька (кэш _account_ttl_sec, сбрасывается ордером/плечом)"""
         self._init_session()
 
+        return await self._single_flight(
+            self._balance_cache,
+            account_type,
+            self._account_ttl_sec,
+            lambda: self._fetch_wallet_balance(account_type),
+            lambda: self._account_generation,
+        )
+
+    async def _fetch_wallet_balance(self, account_type: str) -> dict[str, Any] | None:
         try:
             self.request_count += 1
 
-            response = self.session.get_wallet_balance(accountType=account_type)
-
-            if response["retCode"] == 0:
-                return response["result"]
+            response = await self._call(self.session.get_wallet_balance, accountType=account_type)
 
-            return None
+            return response["result"]
 
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Exception getting wallet balance: {e}")
+            logger.error("Exception getting wallet balance: %s", e)
             return None
 
     # ====== Instruments info / normalization ======
 
-    @async_wrap
-    def get_instruments_info(self, category: str, symbol: str) -> Optional[Dict[str, Any]]:
+    async def get_instruments_info(self, category: str, symbol: str) -> Optional[Dict[str, Any]]:
         """Обертка над v5/market/instruments-info. Возвращает спецификацию символа.
         Возвращает dict: qtyStep, minOrderQty, tickSize, minNotional (если доступно).
         Кэшируется на _instrument_ttl_sec.
         """
         self._init_session()
-        import time as _t
 
-        cache_key = f"{category}:{symbol}"
-        now = _t.time()
-        if cache_key in self._instrument_cache and now - self._instrument_cache_ts.get(cache_key, 0) < self._instrument_ttl_sec:
-            return self._instrument_cache[cache_key]
+        return await self._single_flight(
+            self._instrument_cache,
+            f"{category}:{symbol}",
+            self._instrument_ttl_sec,
+            lambda: self._fetch_instrument_spec(category, symbol),
+        )
 
+    async def _fetch_instrument_spec(self, category: str, symbol: str) -> Optional[Dict[str, Any]]:
         try:
             self.request_count += 1
-            resp = self.session.get_instruments_info(category=category, symbol=symbol)
-            if resp.get("retCode") == 0:
-                items = resp.get("result", {}).get("list", [])
-                if items:
-                    it = items[0]
-                    lot = it.get("lotSizeFilter", {})
-                    price = it.get("priceFilter", {})
-                    spec = {
-                        "qtyStep": float(lot.get("qtyStep", 0) or 0),
-                        "minOrderQty": float(lot.get("minOrderQty", 0) or 0),
-                        "tickSize": float(price.get("tickSize", 0) or 0),
-                        # minNotional может отсутствовать; на тестнете часто используется порог 5 USDT
-                        "minNotional": float(lot.get("minNotional", 0) or 5.0),
-                    }
-                    self._instrument_cache[cache_key] = spec
-                    self._instrument_cache_ts[cache_key] = now
-                    return spec
-            logger.error(f"Get instruments info error for {symbol}: {resp.get('retMsg')}")
+            resp = await self._call(self.session.get_instruments_info, category=category, symbol=symbol)
+            items = resp.get("result", {}).get("list", [])
+            if items:
+                it = items[0]
+                lot = it.get("lotSizeFilter", {})
+                price = it.get("priceFilter", {})
+                spec = {
+                    "qtyStep": float(lot.get("qtyStep", 0) or 0),
+                    "minOrderQty": float(lot.get("minOrderQty", 0) or 0),
+                    "tickSize": float(price.get("tickSize", 0) or 0),
+                    # minNotional может отсутствовать; на тестнете часто используется порог 5 USDT
+                    "minNotional": float(lot.get("minNotional", 0) or 5.0),
+                }
+                # Точность форматирования считаем один раз, а не на каждом ордере
+                spec["qty_dp"] = self._decimal_places(spec["qtyStep"] or 1.0)
+                spec["price_dp"] = self._decimal_places(spec["tickSize"] or 0.0001)
+                return spec
+            logger.error("Get instruments info error for %s: empty list", symbol)
+            return None
+        except BybitAPIError as e:
+            logger.error("Get instruments info error for %s: %s", symbol, e.ret_msg)
             return None
         except Exception as e:
             self.error_count += 1
-            logger.error(f"Exception get_instruments_info for {symbol}: {e}")
+            logger.error("Exception get_instruments_info for %s: %s", symbol, e)
             return None
 
     @staticmethod
@@ -373,19 +678,23 @@ class BybitClient(metaclass=Singleton):
             return len(s.split(".")[1])
         return 0
 
+    @staticmethod
+    def _round_to_step(value: float, step: float, rounding: str) -> float:
+        # Decimal от строкового представления: 0.3 / 0.1 не превращается в 2.9999...
+        d_step = Decimal(str(step))
+        return float((Decimal(str(value)) / d_step).to_integral_value(rounding) * d_step)
+
     @staticmethod
     def _floor_to_step(value: float, step: float) -> float:
         if step <= 0:
             return value
-        import math
-        return math.floor(value / step) * step
+        return BybitClient._round_to_step(value, step, ROUND_FLOOR)
 
     @staticmethod
     def _ceil_to_step(value: float, step: float) -> float:
         if step <= 0:
             return value
-        import math
-        return math.ceil(value / step) * step
+        return BybitClient._round_to_step(value, step, ROUND_CEILING)
 
     async def normalize_order(
         self,
@@ -417,7 +726,7 @@ class BybitClient(metaclass=Singleton):
         if qty * last_price < min_notional:
             qty = self._ceil_to_step(min_notional / max(last_price, 1e-12), qty_step)
         if qty <= 0:
-            logger.error(f"Normalized qty is zero for {symbol} (raw={raw_qty}, step={qty_step})")
+            logger.error("Normalized qty is zero for %s (raw=%s, step=%s)", symbol, raw_qty, qty_step)
             return None
 
         # Нормализация TP/SL по tickSize с учётом стороны
@@ -428,23 +737,28 @@ class BybitClient(metaclass=Singleton):
             tp = self._ceil_to_step(take_profit, tick)
             sl = self._floor_to_step(stop_loss, tick)
 
-        qty_dp = self._decimal_places(qty_step)
-        price_dp = self._decimal_places(tick)
+        qty_dp = spec.get("qty_dp")
+        if qty_dp is None:
+            qty_dp = self._decimal_places(qty_step)
+        price_dp = spec.get("price_dp")
+        if price_dp is None:
+            price_dp = self._decimal_places(tick)
 
         return {
             "qty": qty,
-            "qty_str": f"{qty:.{qty_dp}f}",
+            "qty_str": format(qty, f".{qty_dp}f"),
             "tp": tp,
             "sl": sl,
-            "tp_str": f"{tp:.{price_dp}f}",
-            "sl_str": f"{sl:.{price_dp}f}",
+            "tp_str": format(tp, f".{price_dp}f"),
+            "sl_str": format(sl, f".{price_dp}f"),
             "steps": {"qty_step": qty_step, "tick": tick, "min_qty": min_qty, "min_notional": min_notional},
         }
 
     async def close(self):
         """Закрытие соединений"""
-        self._executor.shutdown(wait=True)
-        logger.info(f"BybitClient closed. Total requests: {self.request_count}, Errors: {self.error_count}")
+        if self.session is not None:
+            await self.session.close()
+        logger.info("BybitClient closed. Total requests: %s, Errors: %s", self.request_count, self.error_count)
 
     def get_stats(self) -> dict[str, Any]:
         """Статистика клиента"""
@@ -452,5 +766,32 @@ class BybitClient(metaclass=Singleton):
             "request_count": self.request_count,
             "error_count": self.error_count,
             "error_rate": f"{(self.error_count / max(self.request_count, 1)) * 100:.2f}%",
+            "timeout_count": self.session.timeout_count if self.session is not None else 0,
             "last_request_time": self.last_request_time
         }
+
+
+_client: BybitClient | None = None
+_client_lock = asyncio.Lock()
+
+
+async def get_client(
+        api_key: str,
+        api_secret: str,
+        testnet: bool = True,
+        demo: bool = False
+) -> BybitClient:
+    """
+    Общий на процесс BybitClient, создаётся лениво под asyncio.Lock
+
+    Повторный вызов с другим api_key — ValueError: иначе вызывающий
+    молча получил бы клиента с чужими ключами.
+    """
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = BybitClient(api_key, api_secret, testnet, demo)
+    if _client.api_key != api_key:
+        raise ValueError("BybitClient уже создан с другим api_key")
+    return _client
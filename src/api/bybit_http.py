@@ -0,0 +1,229 @@
+"""
+Нативный асинхронный HTTP-транспорт Bybit v5 поверх aiohttp
+
+Повторяет имена методов pybit.HTTP, но без блокирующего requests
+и без ThreadPoolExecutor: все запросы выполняются в event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import time
+from typing import Any
+
+import aiohttp
+import orjson
+from yarl import URL
+
+from .rate_limiter import TokenBucket
+
+SUBDOMAIN_MAINNET = "api"
+SUBDOMAIN_TESTNET = "api-testnet"
+DEMO_SUBDOMAIN_MAINNET = "api-demo"
+DEMO_SUBDOMAIN_TESTNET = "api-demo-testnet"
+DOMAIN = "bybit"
+
+# Меньше keepalive_timeout коннектора, чтобы соединение не успевало остыть
+KEEPALIVE_INTERVAL_SEC = 20.0
+
+# Сколько соединений прогреть при старте (DNS + TCP + TLS до первого рабочего запроса)
+PREWARM_CONNECTIONS = 4
+
+# Пауза ведра после 429, если биржа не прислала время сброса лимита, сек
+RATE_LIMIT_PAUSE_SEC = 1.0
+
+# (rate в секунду, ёмкость) по категориям эндпоинтов /v5/<категория>/...
+BUCKET_LIMITS: dict[str, tuple[float, float]] = {
+    "market": (50, 100),
+    "order": (20, 40),
+    "position": (10, 20),
+    "account": (10, 20),
+}
+
+
+class BybitHTTP:
+    """Async сессия Bybit v5 REST с ручной HMAC-SHA256 подписью"""
+
+    def __init__(
+        self,
+        testnet: bool = True,
+        api_key: str | None = None,
+        api_secret: str | None = None,
+        demo: bool = False,
+        recv_window: int = 5000,
+        timeout: float = 10.0,
+        connect_timeout: float = 3.0,
+    ):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.recv_window = recv_window
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.timeout_count = 0
+
+        if demo:
+            subdomain = DEMO_SUBDOMAIN_TESTNET if testnet else DEMO_SUBDOMAIN_MAINNET
+        else:
+            subdomain = SUBDOMAIN_TESTNET if testnet else SUBDOMAIN_MAINNET
+        self.endpoint = f"https://{subdomain}.{DOMAIN}.com"
+
+        self._session: aiohttp.ClientSession | None = None
+        self._keepalive_task: asyncio.Task | None = None
+        self._buckets: dict[str, TokenBucket] = {
+            category: TokenBucket(rate, cap) for category, (rate, cap) in BUCKET_LIMITS.items()
+        }
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Ленивое создание единой сессии (нужен запущенный event loop)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=self.connect_timeout),
+            )
+        return self._session
+
+    async def prewarm(self, connections: int = PREWARM_CONNECTIONS) -> None:
+        """
+        Параллельные пинги /v5/market/time: открывают connections соединений в пуле
+
+        Best-effort — ошибки не пробрасываются, первый рабочий запрос просто
+        откроет соединение сам.
+        """
+        await asyncio.gather(
+            *(self.get_server_time() for _ in range(connections)),
+            return_exceptions=True,
+        )
+
+    def start_keepalive(self, interval: float = KEEPALIVE_INTERVAL_SEC) -> None:
+        """Фоновый пинг /v5/market/time, держит TCP+TLS соединение тёплым"""
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop(interval))
+
+    async def _keepalive_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.get_server_time()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Пинг best-effort: ошибка всплывёт на следующем рабочем запросе
+                pass
+
+    def _sign(self, timestamp: str, payload: str) -> str:
+        param_str = f"{timestamp}{self.api_key}{self.recv_window}{payload}"
+        return hmac.new(
+            (self.api_secret or "").encode("utf-8"),
+            param_str.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        auth: bool = False,
+        cost: float = 1,
+    ) -> dict[str, Any]:
+        """Выполнение запроса. Подписывается ровно та строка, что уходит в сеть."""
+        bucket = self._buckets.get(path.split("/")[2])
+        if bucket is not None:
+            await bucket.acquire(cost)
+
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        headers = {"Content-Type": "application/json"}
+
+        if method == "GET":
+            payload = "&".join(f"{k}={v}" for k, v in params.items())
+            url = URL(f"{self.endpoint}{path}?{payload}" if payload else f"{self.endpoint}{path}", encoded=True)
+            body = None
+        else:
+            payload = orjson.dumps(params).decode()
+            url = URL(f"{self.endpoint}{path}", encoded=True)
+            body = payload
+
+        if auth:
+            timestamp = str(time.time_ns() // 1_000_000)
+            headers.update({
+                "X-BAPI-API-KEY": self.api_key or "",
+                "X-BAPI-SIGN": self._sign(timestamp, payload),
+                "X-BAPI-SIGN-TYPE": "2",
+                "X-BAPI-TIMESTAMP": timestamp,
+                "X-BAPI-RECV-WINDOW": str(self.recv_window),
+            })
+
+        session = self._get_session()
+        try:
+            async with session.request(method, url, data=body, headers=headers) as resp:
+                if resp.status == 429 and bucket is not None:
+                    bucket.penalize(self._rate_limit_pause(resp.headers))
+                resp.raise_for_status()
+                # Парсим сырые байты: без декодирования в str и stdlib json
+                return orjson.loads(await resp.read())
+        except TimeoutError:
+            self.timeout_count += 1
+            raise
+
+    @staticmethod
+    def _rate_limit_pause(headers: Any) -> float:
+        """Сколько ждать после 429: Retry-After, затем X-Bapi-Limit-Reset-Timestamp (мс)"""
+        try:
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                return max(0.0, float(retry_after))
+            reset_ms = headers.get("X-Bapi-Limit-Reset-Timestamp")
+            if reset_ms is not None:
+                return max(0.0, int(reset_ms) / 1000 - time.time())
+        except ValueError:
+            pass
+        return RATE_LIMIT_PAUSE_SEC
+
+    # ===== Market (public) =====
+
+    async def get_server_time(self) -> dict[str, Any]:
+        return await self._request("GET", "/v5/market/time")
+
+    async def get_kline(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("GET", "/v5/market/kline", kwargs)
+
+    async def get_tickers(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("GET", "/v5/market/tickers", kwargs)
+
+    async def get_instruments_info(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("GET", "/v5/market/instruments-info", kwargs)
+
+    # ===== Trade / position / account (private) =====
+
+    async def place_order(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("POST", "/v5/order/create", kwargs, auth=True)
+
+    async def get_order_history(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("GET", "/v5/order/history", kwargs, auth=True)
+
+    async def get_positions(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("GET", "/v5/position/list", kwargs, auth=True)
+
+    async def set_leverage(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("POST", "/v5/position/set-leverage", kwargs, auth=True)
+
+    async def get_wallet_balance(self, **kwargs: Any) -> dict[str, Any]:
+        return await self._request("GET", "/v5/account/wallet-balance", kwargs, auth=True)
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+            self._keepalive_task = None
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
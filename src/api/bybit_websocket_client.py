@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
+import operator
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Callable, Any
 
+import orjson
 from pybit.unified_trading import WebSocket as _WebSocket
 
 from .common import Kline, Singleton
@@ -12,8 +14,34 @@ from ..logger import get_app_logger
 
 logger = get_app_logger()
 
+# Bybit принимает до 10 args в одном subscribe-фрейме (лимит spot)
+TOPICS_PER_SUBSCRIBE = 10
+
+# Ёмкость очереди klines между потоком pybit и event loop
+KLINE_QUEUE_SIZE = 10000
+
+# Klines, ожидающие занятый async callback; при переполнении вытесняются самые старые
+CALLBACK_BACKLOG_SIZE = 1000
+
+# Период проверки watchdog и порог тишины соединения до переподключения, сек
+WATCHDOG_INTERVAL = 30
+STALE_AFTER = 70
+
+# Поля свечи из kline-фрейма одним C-вызовом
+_kline_fields = operator.itemgetter("start", "open", "high", "low", "close", "volume", "confirm")
+
+# Минимальный интервал обновления last_message_times, сек
+STATS_UPDATE_INTERVAL = 0.1
+
 
 class WebSocket(_WebSocket):
+    def _on_message(self, message):
+        """Разбор входящего фрейма через orjson вместо stdlib json"""
+        message = orjson.loads(message)
+        if self._is_custom_pong(message):
+            return
+        self.callback(message)
+
     def kline_stream(self, interval: str | int, symbol: str | list, callback):
         """Subscribe to the klines stream.
 
@@ -33,24 +61,44 @@ class WebSocket(_WebSocket):
             https://bybit-exchange.github.io/docs/v5/websocket/public/kline
         """
         self._validate_public_topic()
-        topic = f"kline.{interval}.{symbol}"
+        # {symbol} подставляет pybit.subscribe — так работает и список символов
+        topic = f"kline.{interval}." + "{symbol}"
         self.subscribe(topic, callback, symbol)
 
 
 class BybitWebSocketClient(metaclass=Singleton):
 
+    __slots__ = (
+        "api_key", "api_secret", "testnet", "demo",
+        "ws_connections", "reconnect_counts", "_watchdog_task", "kline_callbacks", "_cb_table",
+        "ticker_callbacks", "_ticker_state",
+        "messages_received", "last_message_times", "connected",
+        "reconnect_delay", "max_reconnect_attempts",
+        "_loop", "_kline_queue", "_consumer_task", "dropped_messages",
+        "_inbox", "_drain_scheduled", "_callback_tasks", "_callback_backlog",
+    )
+
     def __init__(self, api_key: str, api_secret: str, testnet: bool = True, demo: bool = False):
         self.api_key: str = api_key
         self.api_secret: str = api_secret
         self.testnet: bool = testnet
         self.demo: bool = demo
 
-        # WebSocket соединения
+        # Одно мультиплексированное WebSocket соединение на category
         self.ws_connections: dict[str, WebSocket] = {}
-        self.reconnect_tasks: dict[str, asyncio.Task] = {}
+        # Один sweep-watchdog на все категории; число переподключений по category
+        self.reconnect_counts: dict[str, int] = defaultdict(int)
+        self._watchdog_task: asyncio.Task | None = None
+
+        # Callbacks по (category, topic), topic = "kline.{interval}.{symbol}"
+        self.kline_callbacks: dict[tuple[str, str], list] = defaultdict(list)
+        # Снимок для горячего пути: (sync callbacks, async callbacks) — разбит при подписке
+        self._cb_table: dict[tuple[str, str], tuple[tuple[Callable, ...], tuple[Callable, ...]]] = {}
 
-        # Callbacks для klines
-        self.kline_callbacks: dict[str, list] = defaultdict(list)
+        # Ticker callbacks по (category, "tickers.{symbol}") и последнее состояние тикера
+        # (linear/inverse шлют snapshot, затем delta только с изменившимися полями)
+        self.ticker_callbacks: dict[tuple[str, str], list] = defaultdict(list)
+        self._ticker_state: dict[tuple[str, str], dict] = {}
 
         # Статистика
         self.messages_received: int = 0
@@ -62,15 +110,125 @@ class BybitWebSocketClient(metaclass=Singleton):
         self.max_reconnect_attempts: int = 10
 
         self._loop: asyncio.AbstractEventLoop | None = None
+        self._kline_queue: asyncio.Queue | None = None
+        self._consumer_task: asyncio.Task | None = None
+        self.dropped_messages: int = 0
+        # Klines из потока pybit копятся здесь; один wakeup loop на пачку, а не на сообщение
+        self._inbox: deque[tuple] = deque()
+        self._drain_scheduled: bool = False
+        # Выполняющийся вызов каждого async callback и klines, пришедшие за время вызова
+        self._callback_tasks: dict[Callable, asyncio.Task] = {}
+        self._callback_backlog: dict[Callable, deque[tuple[str, Kline]]] = {}
 
         logger.info(f"BybitWebSocketClient initialized (testnet={testnet})")
 
     async def connect(self) -> None:
         """Подключение к WebSocket"""
         self._loop = asyncio.get_running_loop()
+        if self._consumer_task is None or self._consumer_task.done():
+            self._kline_queue = asyncio.Queue(maxsize=KLINE_QUEUE_SIZE)
+            self._consumer_task = asyncio.create_task(self._consume())
         self.connected = True
+        if self._watchdog_task is None or self._watchdog_task.done():
+            self._watchdog_task = asyncio.create_task(self._sweep())
         logger.info("✅ WebSocket ready")
 
+    def _post(self, item: tuple) -> None:
+        """Передача kline в event loop (поток pybit); wakeup только если drain ещё не запланирован"""
+        self._inbox.append(item)
+        if self._drain_scheduled or self._loop is None:
+            return
+        self._drain_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._drain_inbox)
+        except RuntimeError:
+            # loop уже закрыт
+            self._drain_scheduled = False
+
+    def _drain_inbox(self) -> None:
+        """Перекладывает накопленные klines в очередь потребителя (event loop)"""
+        # Сброс до разбора: сообщение, пришедшее во время drain, запланирует следующий
+        self._drain_scheduled = False
+        inbox = self._inbox
+        while inbox:
+            self._enqueue(inbox.popleft())
+
+    def _enqueue(self, item: tuple) -> None:
+        """Кладёт kline в очередь (в event loop); при переполнении вытесняет самый старый"""
+        queue = self._kline_queue
+        if queue is None:
+            return
+        if queue.full():
+            queue.get_nowait()
+            self.dropped_messages += 1
+            if self.dropped_messages % 1000 == 1:
+                logger.warning(f"⚠️ Kline queue full, dropped {self.dropped_messages} oldest messages")
+        queue.put_nowait(item)
+
+    async def _consume(self) -> None:
+        """
+        Единственный потребитель очереди: sync callbacks вызывает сразу, async запускает
+
+        Async callback не ждём: медленный подписчик (выставление ордера) не
+        задерживает очередь остальных категорий и подписчиков.
+        """
+        queue = self._kline_queue
+        while True:
+            (sync_callbacks, async_callbacks), symbol, kline = await queue.get()
+            for callback in sync_callbacks:
+                try:
+                    callback(symbol, kline)
+                except Exception as e:
+                    logger.error(f"Callback error: {e}", exc_info=True)
+            for callback in async_callbacks:
+                self._start_callback(callback, symbol, kline)
+
+    def _start_callback(self, callback: Callable, symbol: str, kline: Kline) -> None:
+        """Запуск async callback; пока предыдущий вызов не завершён, kline ждёт в его backlog"""
+        if callback in self._callback_tasks:
+            backlog = self._callback_backlog.get(callback)
+            if backlog is None:
+                backlog = self._callback_backlog[callback] = deque(maxlen=CALLBACK_BACKLOG_SIZE)
+            if len(backlog) == CALLBACK_BACKLOG_SIZE:
+                self.dropped_messages += 1
+                if self.dropped_messages % 1000 == 1:
+                    logger.warning(f"⚠️ Callback backlog full, dropped {self.dropped_messages} oldest messages")
+            backlog.append((symbol, kline))
+            return
+        self._callback_tasks[callback] = asyncio.ensure_future(self._run_callback(callback, symbol, kline))
+
+    async def _run_callback(self, callback: Callable, symbol: str, kline: Kline) -> None:
+        """Вызовы одного callback строго по очереди: текущая kline, затем накопленные"""
+        try:
+            while True:
+                try:
+                    await callback(symbol, kline)
+                except Exception as e:
+                    logger.error(f"Callback error: {e}", exc_info=True)
+                backlog = self._callback_backlog.get(callback)
+                if not backlog:
+                    self._callback_backlog.pop(callback, None)
+                    return
+                symbol, kline = backlog.popleft()
+        finally:
+            if self._callback_tasks.get(callback) is asyncio.current_task():
+                del self._callback_tasks[callback]
+
+    def _get_connection(self, category: str) -> WebSocket:
+        """Общее соединение категории; создаётся при первой подписке"""
+        ws = self.ws_connections.get(category)
+        if ws is None:
+            ws = WebSocket(
+                testnet=self.testnet,
+                channel_type=category,
+            )
+            self.ws_connections[category] = ws
+            self.last_message_times[category] = time.monotonic()
+        return ws
+
+    def _dispatcher(self, category: str) -> Callable[[dict], None]:
+        return lambda message: self._dispatch(category, message)
+
     async def subscribe_kline(
         self,
         category: str,
@@ -81,6 +239,9 @@ class BybitWebSocketClient(metaclass=Singleton):
         """
         Подписка на kline stream
 
+        Все топики одной category идут через одно соединение; повторная
+        подписка на тот же топик только добавляет callback.
+
         Args:
             category: "spot" или "linear"
             symbol: Символ пары
@@ -95,37 +256,168 @@ class BybitWebSocketClient(metaclass=Singleton):
         Returns:
             bool: True если подписка создана
         """
-        try:
-            ws_key = f"{category}_{symbol}_{interval}"
-
-            # Создаём WebSocket для этой подписки
-            ws = WebSocket(
-                testnet=self.testnet,
-                channel_type=category,
-            )
-
-            self.ws_connections[ws_key] = ws
-            self.kline_callbacks[ws_key].append(callback)
+        key = (category, f"kline.{interval}.{symbol}")
+        if not self._add_kline_callback(key, callback):
+            logger.info(f"📊 Added callback to kline: {symbol} ({interval} @ {category})")
+            return True
 
-            # Подписываемся на kline
+        try:
+            ws = self._get_connection(category)
             ws.kline_stream(
                 interval=interval,
                 symbol=symbol,
-                callback=lambda msg: self._handle_kline(ws_key, symbol, msg),
+                callback=self._dispatcher(category),
             )
 
             logger.info(f"📊 Subscribed to kline: {symbol} ({interval} @ {category})")
-            
-            # Запускаем watchdog
-            self._start_watchdog(ws_key, category, symbol, interval, callback)
-            
             return True
             
         except Exception as e:
+            self._drop_kline_topic(key)
             logger.error(f"Ошибка создания WS подписки {symbol}@{interval}[{category}]: {e}")
             return False
 
-    def _handle_kline(self, ws_key: str, symbol: str, message: dict) -> None:
+    async def subscribe_klines_bulk(
+        self,
+        category: str,
+        pairs: list[tuple[str, str]],
+        callback: Callable[[str, Kline], None]
+    ) -> set[tuple[str, str]]:
+        """
+        Подписка на набор kline топиков одной category
+
+        Новые топики одного interval уходят общим subscribe-фреймом
+        (по TOPICS_PER_SUBSCRIBE args), а не фреймом на каждый символ.
+
+        Args:
+            category: "spot" или "linear"
+            pairs: Пары (symbol, interval)
+            callback: Функция обратного вызова для всех топиков
+
+        Returns:
+            set: Пары (symbol, interval), на которые подписка активна
+        """
+        new_by_interval: dict[str, list[str]] = defaultdict(list)
+        for symbol, interval in pairs:
+            if self._add_kline_callback((category, f"kline.{interval}.{symbol}"), callback):
+                new_by_interval[interval].append(symbol)
+
+        subscribed = set(pairs)
+        if not new_by_interval:
+            return subscribed
+
+        try:
+            ws = self._get_connection(category)
+        except Exception as e:
+            logger.error(f"Ошибка WS соединения [{category}]: {e}")
+            ws = None
+        dispatcher = self._dispatcher(category)
+        frames = 0
+        for interval, symbols in new_by_interval.items():
+            for i in range(0, len(symbols), TOPICS_PER_SUBSCRIBE):
+                chunk = symbols[i:i + TOPICS_PER_SUBSCRIBE]
+                try:
+                    if ws is None:
+                        raise ConnectionError("нет соединения")
+                    ws.kline_stream(interval=interval, symbol=chunk, callback=dispatcher)
+                    frames += 1
+                except Exception as e:
+                    logger.error(f"Ошибка создания WS подписки {chunk}@{interval}[{category}]: {e}")
+                    for symbol in chunk:
+                        self._drop_kline_topic((category, f"kline.{interval}.{symbol}"))
+                        subscribed.discard((symbol, interval))
+
+        new_count = sum(len(symbols) for symbols in new_by_interval.values())
+        logger.info(f"📊 Subscribed to {new_count} kline topics @ {category} in {frames} frames")
+        return subscribed
+
+    def _add_kline_callback(self, key: tuple[str, str], callback: Callable) -> bool:
+        """Добавить callback топику; True — топик новый и на него нужно подписаться"""
+        callbacks = self.kline_callbacks[key]
+        callbacks.append(callback)
+        self._cb_table[key] = (
+            tuple(cb for cb in callbacks if not asyncio.iscoroutinefunction(cb)),
+            tuple(cb for cb in callbacks if asyncio.iscoroutinefunction(cb)),
+        )
+        return len(callbacks) == 1
+
+    def _drop_kline_topic(self, key: tuple[str, str]) -> None:
+        self.kline_callbacks.pop(key, None)
+        self._cb_table.pop(key, None)
+
+    async def subscribe_ticker(
+        self,
+        category: str,
+        symbol: str,
+        callback: Callable[[str, dict], None]
+    ) -> bool:
+        """
+        Подписка на ticker stream (push при каждом изменении, без REST опроса)
+
+        callback(symbol, ticker) синхронный, вызывается в event loop с полным
+        тикером — delta-сообщения уже слиты с последним snapshot; на каждое
+        сообщение новый dict.
+
+        Returns:
+            bool: True если подписка создана
+        """
+        key = (category, f"tickers.{symbol}")
+        callbacks = self.ticker_callbacks[key]
+        callbacks.append(callback)
+
+        if len(callbacks) > 1:
+            return True
+
+        try:
+            ws = self._get_connection(category)
+            ws.ticker_stream(symbol=symbol, callback=self._dispatcher(category))
+
+            logger.info(f"📊 Subscribed to ticker: {symbol} @ {category}")
+            return True
+
+        except Exception as e:
+            del self.ticker_callbacks[key]
+            logger.error(f"Ошибка создания WS подписки ticker {symbol}[{category}]: {e}")
+            return False
+
+    def _dispatch(self, category: str, message: dict) -> None:
+        """Маршрутизация сообщения общего соединения по topic (поток pybit)"""
+        self.messages_received += 1
+        # Отметка активности для watchdog: чаще раза в STATS_UPDATE_INTERVAL не пишем
+        now = time.monotonic()
+        if now - self.last_message_times.get(category, 0.0) > STATS_UPDATE_INTERVAL:
+            self.last_message_times[category] = now
+
+        topic = message.get("topic", "")
+        if topic.startswith("kline"):
+            self._handle_kline(category, topic.rsplit(".", 1)[-1], message)
+        elif topic.startswith("tickers"):
+            self._handle_ticker(category, topic, message)
+
+    def _handle_ticker(self, category: str, topic: str, message: dict) -> None:
+        """Слияние snapshot/delta тикера и передача полного тикера в event loop (поток pybit)"""
+        key = (category, topic)
+        callbacks = self.ticker_callbacks.get(key)
+        data = message.get("data")
+        if not callbacks or not data:
+            return
+
+        if message.get("type") == "delta":
+            ticker = {**self._ticker_state.get(key, {}), **data}
+        else:
+            ticker = dict(data)
+        self._ticker_state[key] = ticker
+
+        if self._loop is not None:
+            symbol = topic[len("tickers."):]
+            try:
+                for callback in tuple(callbacks):
+                    self._loop.call_soon_threadsafe(callback, symbol, ticker)
+            except RuntimeError:
+                # loop уже закрыт
+                pass
+
+    def _handle_kline(self, category: str, symbol: str, message: dict) -> None:
         """
         Обработка kline сообщения
         msg: dict {
@@ -151,46 +443,23 @@ class BybitWebSocketClient(metaclass=Singleton):
         """
 
         try:
-            self.messages_received += 1
-            self.last_message_times[ws_key] = time.time()
-
-            # Формат сообщения от Bybit WebSocket
-            if message.get("topic", "").startswith("kline"):
+            callbacks = self._cb_table.get((category, message.get("topic", "")))
+            if callbacks:
                 data = message.get("data", [])
 
                 if data:
                     kline_data = data[0] if isinstance(data, list) else data
 
-                    # Извлекаем данные свечи
-                    kline = Kline(
-                        timestamp=int(kline_data.get("start", 0)),
-                        open=float(kline_data.get("open", 0)),
-                        high=float(kline_data.get("high", 0)),
-                        low=float(kline_data.get("low", 0)),
-                        close=float(kline_data.get("close", 0)),
-                        volume=float(kline_data.get("volume", 0)),
-                        confirm=kline_data.get("confirm", False)  # True когда свеча закрылась
-                    )
-
-                    # Вызываем callbacks
-                    if self._loop is not None:
-                        for callback in self.kline_callbacks[ws_key]:
-                            try:
-                                # Проверяем что это async функция
-                                if asyncio.iscoroutinefunction(callback):
-                                    try:
-                                        asyncio.run_coroutine_threadsafe(
-                                            callback(symbol, kline),
-                                            self._loop
-                                        )
-                                    except RuntimeError:
-                                        break
-                                else:
-                                    # Sync callback - вызываем напрямую
-                                    callback(symbol, kline)
-
-                            except Exception as e:
-                                logger.error(f"Callback error: {e}", exc_info=True)
+                    # Извлекаем данные свечи; confirm True когда свеча закрылась
+                    try:
+                        start, o, h, l, c, v, confirm = _kline_fields(kline_data)
+                    except KeyError as e:
+                        logger.warning(f"Malformed kline frame for {symbol}, missing {e}")
+                        return
+                    kline = Kline(int(start), float(o), float(h), float(l), float(c), float(v), confirm)
+
+                    # Пачка сообщений между wakeup'ами уходит в loop одним drain; callbacks вызовет _consume
+                    self._post((callbacks, symbol, kline))
 
                     if kline.confirm:
                         logger.debug(f"📊 {symbol} kline closed: ${kline.close:.8f}")
@@ -198,50 +467,93 @@ class BybitWebSocketClient(metaclass=Singleton):
         except Exception as e:
             logger.error(f"Error handling kline: {e}")
 
-    def _start_watchdog(self, ws_key: str, category: str, symbol: str, interval: str, callback: Callable) -> None:
-        """Запуск watchdog для отслеживания разрывов"""
-
-        async def watchdog() -> None:
-            """Проверка активности соединения"""
-            reconnect_count = 0
-
-            while self.connected and reconnect_count < self.max_reconnect_attempts:
-                await asyncio.sleep(30)
+    async def _sweep(self) -> None:
+        """Проверка активности всех соединений раз в WATCHDOG_INTERVAL"""
+        while self.connected:
+            await asyncio.sleep(WATCHDOG_INTERVAL)
 
-                last_message_time = self.last_message_times.get(ws_key, 0)
-                time_since_last = time.time() - last_message_time
+            now = time.monotonic()
+            for category, last_message_time in list(self.last_message_times.items()):
+                if now - last_message_time <= STALE_AFTER:
+                    continue
+                if self.reconnect_counts[category] >= self.max_reconnect_attempts:
+                    continue
 
-                if time_since_last > 70:
-                    logger.warning(f"⚠️ No messages for {ws_key}, reconnecting...")
+                logger.warning(f"⚠️ No messages for {category}, reconnecting...")
 
-                    try:
-                        if ws_key in self.ws_connections:
-                            del self.ws_connections[ws_key]
+                try:
+                    self._reconnect(category)
+                    self.reconnect_counts[category] += 1
 
-                        await self.subscribe_kline(category, symbol, interval, callback)
-                        reconnect_count += 1
+                    logger.info(f"✅ Reconnected {category} (attempt {self.reconnect_counts[category]})")
 
-                        logger.info(f"✅ Reconnected {ws_key} (attempt {reconnect_count})")
+                except Exception as e:
+                    logger.error(f"Reconnect failed: {e}")
+                    await asyncio.sleep(self.reconnect_delay)
 
-                    except Exception as e:
-                        logger.error(f"Reconnect failed: {e}")
-                        await asyncio.sleep(self.reconnect_delay)
+    def _reconnect(self, category: str) -> None:
+        """Пересоздать соединение категории и переподписать все её топики пачками"""
+        old = self.ws_connections.pop(category, None)
+        if old is not None:
+            try:
+                old.exit()
+            except Exception as e:
+                logger.error(f"Error closing WebSocket: {e}")
 
-        task = asyncio.create_task(watchdog())
-        self.reconnect_tasks[ws_key] = task
+        ws = WebSocket(
+            testnet=self.testnet,
+            channel_type=category,
+        )
+        self.ws_connections[category] = ws
+        self.last_message_times[category] = time.monotonic()
+
+        symbols_by_interval: dict[str, list[str]] = defaultdict(list)
+        for cat, topic in self.kline_callbacks:
+            if cat == category:
+                _, interval, symbol = topic.split(".", 2)
+                symbols_by_interval[interval].append(symbol)
+
+        dispatcher = self._dispatcher(category)
+        for interval, symbols in symbols_by_interval.items():
+            for i in range(0, len(symbols), TOPICS_PER_SUBSCRIBE):
+                ws.kline_stream(
+                    interval=interval,
+                    symbol=symbols[i:i + TOPICS_PER_SUBSCRIBE],
+                    callback=dispatcher,
+                )
+
+        # Новое соединение начнёт тикеры со snapshot — старое delta-состояние не нужно
+        ticker_symbols = []
+        for cat, topic in self.ticker_callbacks:
+            if cat == category:
+                self._ticker_state.pop((cat, topic), None)
+                ticker_symbols.append(topic[len("tickers."):])
+        for i in range(0, len(ticker_symbols), TOPICS_PER_SUBSCRIBE):
+            ws.ticker_stream(symbol=ticker_symbols[i:i + TOPICS_PER_SUBSCRIBE], callback=dispatcher)
 
     async def close(self) -> None:
         """Закрытие WebSocket соединений"""
         self.connected = False
 
-        # Отменяем все watchdog tasks
-        for task in self.reconnect_tasks.values():
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+        if self._consumer_task is not None and not self._consumer_task.done():
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
+        self._consumer_task = None
+
+        # Выполняющиеся callbacks не отменяем (внутри может быть выставление ордера)
+        self._callback_backlog.clear()
+        await asyncio.gather(*self._callback_tasks.values(), return_exceptions=True)
+
+        if self._watchdog_task is not None and not self._watchdog_task.done():
+            self._watchdog_task.cancel()
+            try:
+                await self._watchdog_task
+            except asyncio.CancelledError:
+                pass
+        self._watchdog_task = None
 
         # Закрываем WebSocket соединения
         for ws in self.ws_connections.values():
@@ -252,7 +564,6 @@ class BybitWebSocketClient(metaclass=Singleton):
                 logger.error(f"Error closing WebSocket: {e}")
 
         self.ws_connections.clear()
-        self.reconnect_tasks.clear()
 
         logger.info("WebSocket connections closed")
 
@@ -261,6 +572,10 @@ class BybitWebSocketClient(metaclass=Singleton):
         return {
             "connected": self.connected,
             "messages_received": self.messages_received,
-            "active_subscriptions": len(self.ws_connections),
-            "watchdog_tasks": len(self.reconnect_tasks),
+            "active_subscriptions": len(self.kline_callbacks),
+            "active_ticker_subscriptions": len(self.ticker_callbacks),
+            "connections": len(self.ws_connections),
+            "reconnects": dict(self.reconnect_counts),
+            "queued_messages": self._kline_queue.qsize() if self._kline_queue is not None else 0,
+            "dropped_messages": self.dropped_messages,
         }
@@ -1,7 +1,39 @@
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+
+from collections.abc import Iterator
 from dataclasses import dataclass
 
+import numpy as np
+
+
+# Длительность frame в секундах: интервалы Bybit и типовые секундные frame polling
+FRAME_SECONDS: dict[str, int] = {
+    "1": 60, "3": 180, "5": 300, "15": 900, "30": 1800,
+    "60": 3600, "120": 7200, "240": 14400, "360": 21600, "720": 43200,
+    "D": 86400, "W": 604800, "M": 2592000,
+    "1s": 1, "5s": 5, "10s": 10, "15s": 15, "30s": 30,
+}
+
+# Пауза после ошибки polling цикла: base * 2^(ошибок подряд - 1), не больше max, сек
+POLL_ERROR_BASE_DELAY = 0.25
+POLL_ERROR_MAX_DELAY = 60.0
+
 
-@dataclass
+def frame_to_seconds(frame: str) -> int:
+    """Frame в секунды: таблица, для прочих "<N>s" — секунды, "<N>" — минуты"""
+    seconds = FRAME_SECONDS.get(frame)
+    if seconds is not None:
+        return seconds
+    if frame.endswith("s"):
+        return int(frame[:-1])
+    return int(frame) * 60
+
+
+@dataclass(frozen=True, slots=True)
 class Kline:
     timestamp: int
     open: float
@@ -12,10 +44,118 @@ class Kline:
     confirm: bool = False # True когда свеча закрылась
 
 
+def ticker_to_kline(ticker: dict, timestamp_ms: int | None = None) -> Kline:
+    """
+    Подтверждённая свеча-снимок из плоского тикера (элемент result.list или WS ticker)
+
+    Пустые строки и отсутствующие поля high/low заменяются last, volume — нулём.
+    timestamp_ms можно посчитать один раз на цикл опроса.
+    """
+    get = ticker.get
+    last = float(get("lastPrice") or 0)
+    return Kline(
+        time.time_ns() // 1_000_000 if timestamp_ms is None else timestamp_ms,
+        last,
+        float(get("highPrice24h") or last),
+        float(get("lowPrice24h") or last),
+        last,
+        float(get("volume24h") or 0),
+        True,
+    )
+
+
+class KlineBatch:
+    """
+    Колоночное (SoA) представление свечей из REST
+
+    Хранит ts/open/high/low/close/volume как массивы NumPy. Поддерживает
+    len/индексацию/итерацию как список Kline, объекты Kline создаются
+    только при обращении к элементу или через as_klines().
+    """
+
+    __slots__ = ("ts", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        ts: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ):
+        self.ts = ts
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_bybit(cls, rows: list[list[str]]) -> KlineBatch:
+        """Строки Bybit (новые сверху) -> батч в хронологическом порядке"""
+        if not rows:
+            empty = np.empty(0, dtype=np.float64)
+            return cls(np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty)
+
+        # Одна C-конверсия строк в float64 (ts в мс < 2**53 — без потерь), без object-массива
+        arr = np.flip(np.asarray(rows, dtype=np.float64), axis=0)
+        return cls(arr[:, 0].astype(np.int64), arr[:, 1], arr[:, 2], arr[:, 3], arr[:, 4], arr[:, 5])
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, item: int | slice) -> Kline | KlineBatch:
+        if isinstance(item, slice):
+            return KlineBatch(
+                self.ts[item], self.open[item], self.high[item],
+                self.low[item], self.close[item], self.volume[item],
+            )
+        return Kline(
+            timestamp=int(self.ts[item]),
+            open=float(self.open[item]),
+            high=float(self.high[item]),
+            low=float(self.low[item]),
+            close=float(self.close[item]),
+            volume=float(self.volume[item]),
+            confirm=False,
+        )
+
+    def __iter__(self) -> Iterator[Kline]:
+        return iter(self.as_klines())
+
+    def as_klines(self) -> list[Kline]:
+        """Материализация в список Kline для кода, ожидающего объекты"""
+        return [
+            Kline(timestamp=t, open=o, high=h, low=lo, close=c, volume=v, confirm=False)
+            for t, o, h, lo, c, v in zip(
+                self.ts.tolist(), self.open.tolist(), self.high.tolist(),
+                self.low.tolist(), self.close.tolist(), self.volume.tolist(),
+            )
+        ]
+
+
 class Singleton(type):
     _instances = {}
+    # Double-checked locking: два потока не должны одновременно выполнить __init__
+    _lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+            with cls._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+                    return cls._instances[cls]
+
+        instance = cls._instances[cls]
+        # Повторное создание с другим api_key вернуло бы клиента с чужими ключами
+        existing_key = getattr(instance, "api_key", None)
+        if existing_key is not None:
+            bound = inspect.signature(cls.__init__).bind_partial(instance, *args, **kwargs)
+            requested_key = bound.arguments.get("api_key", existing_key)
+            if requested_key != existing_key:
+                raise ValueError(
+                    f"{cls.__name__} уже создан с другим api_key; "
+                    f"Singleton нельзя переинициализировать"
+                )
+        return instance
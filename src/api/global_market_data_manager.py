@@ -3,20 +3,31 @@
 """
 
 import asyncio
+import logging
+import sys
 import time
-from typing import Callable
-from dataclasses import dataclass
+from collections import deque
+from typing import Callable, Iterable
+from dataclasses import dataclass, field
 
 from ..logger import get_app_logger
 from ..config import StrategyConfig
-from .bybit_client import BybitClient
+from .bybit_client import BybitClient, backoff_delay
 from .bybit_websocket_client import BybitWebSocketClient
-from .common import Kline
+from .common import POLL_ERROR_BASE_DELAY, POLL_ERROR_MAX_DELAY, Kline, frame_to_seconds, ticker_to_kline
 
 logger = get_app_logger()
 
+# Тикер из WS старше этого считается устаревшим — символ опрашивается через REST, сек
+WS_TICKER_MAX_AGE = 30.0
 
-@dataclass
+# Сколько рассылка свечи ждёт callbacks стратегий, сек; медленные дорабатывают в фоне
+CALLBACK_TIMEOUT = 0.5
+
+# Свечи, ожидающие занятый callback стратегии; при переполнении вытесняются самые старые
+CALLBACK_BACKLOG_SIZE = 1000
+
+@dataclass(frozen=True, slots=True)
 class SubscriptionRequest:
     strategy_name: str
     symbol: str
@@ -24,6 +35,36 @@ class SubscriptionRequest:
     market_category: str  # "spot" | "linear"
     callback: Callable[[str, Kline], None]
     source_type: str  # "websocket" | "polling"
+    # Ключ (symbol, frame, category), собранный один раз при создании
+    key: tuple[str, str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "key", (self.symbol, self.frame, self.market_category))
+
+
+class SubBucket:
+    """
+    Подписки одного символа в индексе: параллельные списки подписок и их callbacks
+
+    Рассылка идёт только по callbacks; SubscriptionRequest нужен лишь для
+    логирования ошибок. Источник не хранится — индексы уже разделены на WS и polling.
+    """
+
+    __slots__ = ("subs", "callbacks")
+
+    def __init__(self, subs: Iterable[SubscriptionRequest] = ()) -> None:
+        self.subs: list[SubscriptionRequest] = list(subs)
+        self.callbacks: list[Callable[[str, Kline], None]] = [s.callback for s in self.subs]
+
+    def append(self, sub: SubscriptionRequest) -> None:
+        self.subs.append(sub)
+        self.callbacks.append(sub.callback)
+
+    def __iter__(self):
+        return iter(self.subs)
+
+    def __len__(self) -> int:
+        return len(self.subs)
 
 
 class GlobalMarketDataManager:
@@ -38,25 +79,58 @@ class GlobalMarketDataManager:
         # Подписки: {(symbol, frame, category): [SubscriptionRequest, ...]}
         self.subscriptions: dict[tuple[str, str, str], list[SubscriptionRequest]] = {}
 
+        # Владельцы ключа для O(1) дедупликации: {(symbol, frame, category): {strategy_name}}
+        self._sub_owners: dict[tuple[str, str, str], set[str]] = {}
+
+        # Индекс WS подписок по символу для _ws_callback: {symbol: SubBucket}
+        self.ws_subs_by_symbol: dict[str, SubBucket] = {}
+
+        # Polling подписки по группе и символу: {(frame, category): {symbol: SubBucket}}
+        self.poll_subs: dict[tuple[str, str], dict[str, SubBucket]] = {}
+
+        # Счётчики подписок для get_stats, ведутся при добавлении/удалении
+        self._polling_count = 0
+        self._websocket_count = 0
+        self._subs_by_category: dict[str, int] = {}
+
         # Активные WS подписки {(symbol, frame, category)}
         self.active_ws_subscriptions: set[tuple[str, str, str]] = set()
 
         # Polling задачи по ключу (frame, category)
         self.polling_tasks: dict[tuple[str, str], asyncio.Task] = {}
         self.polling_active = False
-        self.last_poll_times: dict[tuple[str, str], float] = {}
+
+        # Последние тикеры из WS ticker stream: {(category, symbol): (monotonic ts, ticker)}
+        self._ws_tickers: dict[tuple[str, str], tuple[float, dict]] = {}
+        self.active_ticker_subscriptions: set[tuple[str, str]] = set()
+
+        # Последний тикер и построенная из него свеча: {(category, symbol): (ticker, Kline)}
+        self._kline_cache: dict[tuple[str, str], tuple[dict, Kline]] = {}
 
         self.registered_strategies: set[str] = set()
         self.is_running = False
 
+        # Ожидание callbacks на одну свечу; выполняющийся вызов каждого callback
+        # и свечи, пришедшие за время вызова, по порядку: {callback: deque[(symbol, Kline, where)]}
+        self.callback_timeout: float = CALLBACK_TIMEOUT
+        self._callback_tasks: dict[Callable, asyncio.Task] = {}
+        self._callback_backlog: dict[Callable, deque[tuple[str, Kline, str]]] = {}
+        self.dropped_klines: int = 0
+
+        # Активация стратегий, зарегистрированных после start(): один worker, по очереди
+        self._activation_queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self._activation_worker: asyncio.Task | None = None
+
         logger.info("🌍 GlobalMarketDataManager инициализирован (per-signal frame)")
 
-    def _get_symbol_category(self, strategy_config: StrategyConfig, symbol: str) -> str:
-        """Определяем категорию для символа по strategy_config."""
-        try:
-            return strategy_config.get_pair_category(symbol)
-        except AttributeError:
-            return strategy_config.get_market_category()
+    @staticmethod
+    def _category_resolver(strategy_config: StrategyConfig) -> Callable[[str], str]:
+        """Функция symbol -> category для strategy_config; метод конфига резолвится один раз"""
+        get_pair_category = getattr(strategy_config, "get_pair_category", None)
+        if get_pair_category is not None:
+            return get_pair_category
+        market_category = strategy_config.get_market_category()
+        return lambda symbol: market_category
 
     def register_strategy_v2(
         self, strategy_config: StrategyConfig, kline_callback: Callable[[str, Kline], None]
@@ -73,19 +147,23 @@ class GlobalMarketDataManager:
 
         logger.info(f"[{name}] 📝 Регистрация стратегии (per-signal frame)...")
         count = 0
+        # Категория символа не зависит от сигнала: считаем один раз на символ
+        get_category = self._category_resolver(strategy_config)
+        categories = {
+            symbol: get_category(symbol)
+            for symbol in {*strategy_config.trade_pairs, *(sig.index for sig in strategy_config.signals.values())}
+        }
         
         for signal_name, sig in strategy_config.signals.items():
             source = "polling" if sig.frame.endswith("s") else "websocket"
             
             # 1. index пара с своим frame
-            idx_cat = self._get_symbol_category(strategy_config, sig.index)
-            self._add_subscription(name, sig.index, sig.frame, idx_cat, kline_callback, source)
+            self._add_subscription(name, sig.index, sig.frame, categories[sig.index], kline_callback, source)
             count += 1
             
             # 2. все trade_pairs с этим же frame
             for pair in strategy_config.trade_pairs:
-                pair_cat = self._get_symbol_category(strategy_config, pair)
-                self._add_subscription(name, pair, sig.frame, pair_cat, kline_callback, source)
+                self._add_subscription(name, pair, sig.frame, categories[pair], kline_callback, source)
                 count += 1
                 
             logger.info(f"   [{signal_name}] @ {sig.frame}: {sig.index} + {len(strategy_config.trade_pairs)} targets")
@@ -94,7 +172,7 @@ class GlobalMarketDataManager:
         logger.info(f"[{name}] ✅ Зарегистрировано {count} подписок (per-signal frame)")
         
         if self.is_running:
-            asyncio.create_task(self._activate_new_subscriptions(name))
+            self._activation_queue.put_nowait(name)
 
     def register_strategy(
         self, strategy_config: StrategyConfig, kline_callback: Callable[[str, Kline], None]
@@ -111,12 +189,46 @@ class GlobalMarketDataManager:
         callback: Callable[[str, Kline], None],
         source_type: str,
     ) -> None:
+        # Строки из конфига интернируем: ключи индексов сравниваются по identity
+        symbol, frame, market_category = sys.intern(symbol), sys.intern(frame), sys.intern(market_category)
         key = (symbol, frame, market_category)
-        sub = SubscriptionRequest(strategy_name, symbol, frame, market_category, callback, source_type)
-        self.subscriptions.setdefault(key, [])
-        if not any(s.strategy_name == strategy_name for s in self.subscriptions[key]):
+        # get + явная вставка: setdefault создавал бы пустой контейнер на каждый вызов
+        owners = self._sub_owners.get(key)
+        if owners is None:
+            owners = self._sub_owners[key] = set()
+            self.subscriptions[key] = []
+        if strategy_name not in owners:
+            owners.add(strategy_name)
+            sub = SubscriptionRequest(strategy_name, symbol, frame, market_category, callback, source_type)
             self.subscriptions[key].append(sub)
-            logger.debug(f"   + {symbol} @ {frame} [{market_category}] ({source_type}) -> [{strategy_name}]")
+            if source_type == "websocket":
+                self._bucket(self.ws_subs_by_symbol, symbol).append(sub)
+            else:
+                group = self.poll_subs.get((frame, market_category))
+                if group is None:
+                    group = self.poll_subs[(frame, market_category)] = {}
+                self._bucket(group, symbol).append(sub)
+            self._count_subscription(sub, 1)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"   + {symbol} @ {frame} [{market_category}] ({source_type}) -> [{strategy_name}]")
+
+    @staticmethod
+    def _bucket(by_symbol: dict[str, SubBucket], symbol: str) -> SubBucket:
+        bucket = by_symbol.get(symbol)
+        if bucket is None:
+            bucket = by_symbol[symbol] = SubBucket()
+        return bucket
+
+    def _count_subscription(self, sub: SubscriptionRequest, delta: int) -> None:
+        if sub.source_type == "polling":
+            self._polling_count += delta
+        else:
+            self._websocket_count += delta
+        count = self._subs_by_category.get(sub.market_category, 0) + delta
+        if count:
+            self._subs_by_category[sub.market_category] = count
+        else:
+            self._subs_by_category.pop(sub.market_category, None)
 
     async def start(self) -> None:
         if self.is_running:
@@ -124,18 +236,16 @@ class GlobalMarketDataManager:
             return
         logger.info("🚀 Запуск GlobalMarketDataManager (per-signal frame)...")
         await self._start_websocket_subscriptions()
+        await self._start_ticker_ws_subscriptions()
         await self._start_polling_tasks()
+        self._activation_worker = asyncio.create_task(self._activation_worker_loop())
         self.is_running = True
         
-        total = len(self.subscriptions)
-        polling = sum(1 for subs in self.subscriptions.values() for s in subs if s.source_type == "polling")
-        ws = sum(1 for subs in self.subscriptions.values() for s in subs if s.source_type == "websocket")
-        
         logger.info("")
         logger.info("🌍 ═══ GLOBAL MARKET DATA MANAGER ACTIVE ═══")
-        logger.info(f"   Keys (symbol@frame@category): {total}")
-        logger.info(f"   📡 Polling subs: {polling}")
-        logger.info(f"   🔌 WebSocket subs: {ws}")
+        logger.info(f"   Keys (symbol@frame@category): {len(self.subscriptions)}")
+        logger.info(f"   📡 Polling subs: {self._polling_count}")
+        logger.info(f"   🔌 WebSocket subs: {self._websocket_count}")
         logger.info(f"   Active WS subs: {len(self.active_ws_subscriptions)}")
         logger.info(f"   Active polling tasks: {len(self.polling_tasks)}")
         logger.info("═" * 70)
@@ -144,9 +254,22 @@ class GlobalMarketDataManager:
     async def stop(self) -> None:
         logger.info("⏹ Остановка GlobalMarketDataManager...")
         self.is_running = False
+        await self._stop_activation_worker()
         await self._stop_polling_tasks()
+        # Callbacks не отменяем (внутри может быть выставление ордера): дожидаемся,
+        # накопленные за время вызова свечи уже не отдаём
+        self._callback_backlog.clear()
+        await asyncio.gather(*self._callback_tasks.values(), return_exceptions=True)
+        self._callback_backlog.clear()
         self.subscriptions.clear()
+        self._sub_owners.clear()
+        self.ws_subs_by_symbol.clear()
+        self.poll_subs.clear()
+        self._polling_count = 0
+        self._websocket_count = 0
+        self._subs_by_category.clear()
         self.active_ws_subscriptions.clear()
+        self._ws_tickers.clear()
         self.registered_strategies.clear()
         logger.info("✅ GlobalMarketDataManager остановлен")
 
@@ -156,189 +279,325 @@ class GlobalMarketDataManager:
         logger.info(f"[{strategy_name}] 📤 Отмена регистрации...")
         to_delete: list[tuple[str, str, str]] = []
         for key, subs in list(self.subscriptions.items()):
-            self.subscriptions[key] = [s for s in subs if s.strategy_name != strategy_name]
-            if not self.subscriptions[key]:
+            kept = []
+            for s in subs:
+                if s.strategy_name == strategy_name:
+                    self._count_subscription(s, -1)
+                else:
+                    kept.append(s)
+            self.subscriptions[key] = kept
+            self._sub_owners[key].discard(strategy_name)
+            if not kept:
                 to_delete.append(key)
         for key in to_delete:
             del self.subscriptions[key]
+            del self._sub_owners[key]
             if key in self.active_ws_subscriptions:
                 self.active_ws_subscriptions.remove(key)
+        self._drop_strategy(self.ws_subs_by_symbol, strategy_name)
+        for group_key, by_symbol in list(self.poll_subs.items()):
+            self._drop_strategy(by_symbol, strategy_name)
+            if not by_symbol:
+                del self.poll_subs[group_key]
         self.registered_strategies.remove(strategy_name)
         logger.info(f"[{strategy_name}] ✅ Отмена регистрации завершена")
 
+    @staticmethod
+    def _drop_strategy(by_symbol: dict[str, SubBucket], strategy_name: str) -> None:
+        """Убрать подписки стратегии из индекса по символу (in place: индекс читают polling циклы)"""
+        for symbol, bucket in list(by_symbol.items()):
+            subs = SubBucket(s for s in bucket.subs if s.strategy_name != strategy_name)
+            if subs:
+                by_symbol[symbol] = subs
+            else:
+                del by_symbol[symbol]
+
     # ===== WebSocket =====
     async def _start_websocket_subscriptions(self) -> None:
-        ws_keys: set[tuple[str, str, str]] = set()
-        for (symbol, frame, category), subs in self.subscriptions.items():
-            if any(s.source_type == "websocket" for s in subs):
-                ws_keys.add((symbol, frame, category))
-        if not ws_keys:
+        ws_keys = {s.key for subs in self.ws_subs_by_symbol.values() for s in subs}
+        # Только ещё не активные: повторная активация не переподписывает существующие
+        new_keys = ws_keys - self.active_ws_subscriptions
+        if not new_keys:
             logger.info("Нет WebSocket подписок для активации")
             return
-        logger.info(f"Запуск {len(ws_keys)} WebSocket подписок...")
-        for symbol, frame, category in ws_keys:
+        logger.info(f"Запуск {len(new_keys)} WebSocket подписок...")
+        # Помечаем до await: параллельная активация не подпишет ключ второй раз
+        self.active_ws_subscriptions |= new_keys
+        by_category: dict[str, list[tuple[str, str]]] = {}
+        for symbol, frame, category in sorted(new_keys):
+            by_category.setdefault(category, []).append((symbol, frame))
+        # Один bulk вызов на category: топики уходят общими subscribe-фреймами
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for category, pairs in by_category.items():
             try:
-                await self.ws_client.subscribe_kline(
+                subscribed = await self.ws_client.subscribe_klines_bulk(
                     category=category,
-                    symbol=symbol,
-                    interval=frame,
+                    pairs=pairs,
                     callback=self._ws_callback,
                 )
-                self.active_ws_subscriptions.add((symbol, frame, category))
-                logger.debug(f"   ✓ WS: {symbol} @ {frame} [{category}]")
             except Exception as e:
-                logger.error(f"Ошибка WS подписки {symbol}@{frame}[{category}]: {e}")
+                logger.error(f"Ошибка WS подписки [{category}] ({len(pairs)} топиков): {e}")
+                subscribed = set()
+            for symbol, frame in pairs:
+                if (symbol, frame) not in subscribed:
+                    self.active_ws_subscriptions.discard((symbol, frame, category))
+                elif debug:
+                    logger.debug(f"   ✓ WS: {symbol} @ {frame} [{category}]")
         logger.info(f"✅ WebSocket: {len(self.active_ws_subscriptions)} активных подписок")
 
     async def _ws_callback(self, symbol: str, kline: Kline) -> None:
         if not kline.confirm:
             return
-        # Транслируем во все подписки по этому symbol
-        for (sub_symbol, sub_frame, sub_cat), subs in self.subscriptions.items():
-            if sub_symbol != symbol:
+        # Транслируем во все WS подписки по этому symbol
+        subs = self.ws_subs_by_symbol.get(symbol)
+        if not subs:
+            return
+        # Не ждём стратегии: consumer WS клиента общий для всех категорий и подписчиков
+        self._dispatch(subs, symbol, kline, "WS")
+
+    def _dispatch(self, bucket: SubBucket | None, symbol: str, kline: Kline, source: str) -> list[asyncio.Task]:
+        """
+        Запуск callbacks подписок; у каждого callback не больше одного вызова одновременно
+
+        Пока предыдущий вызов стратегии не завершился, её новые свечи ждут
+        в очереди callback и отдаются тем же вызовом по порядку: второй вызов
+        не пройдёт проверку открытой позиции параллельно с первым.
+        """
+        if not bucket:
+            return []
+        tasks: list[asyncio.Task] = []
+        for s, cb in zip(bucket.subs, bucket.callbacks):
+            where = f"{source} callback [{s.strategy_name}]"
+            if cb in self._callback_tasks:
+                self._defer_callback(cb, symbol, kline, where)
                 continue
-            for s in subs:
-                if s.source_type == "websocket":
-                    try:
-                        await s.callback(symbol, kline)
-                    except Exception as e:
-                        logger.error(f"Ошибка WS callback [{s.strategy_name}] {symbol}@{sub_frame}[{sub_cat}]: {e}")
+            task = asyncio.ensure_future(self._run_callback(cb, symbol, kline, where))
+            self._callback_tasks[cb] = task
+            tasks.append(task)
+        return tasks
+
+    def _defer_callback(self, callback: Callable, symbol: str, kline: Kline, where: str) -> None:
+        """Свеча в очередь занятого callback; при переполнении вытесняется самая старая"""
+        backlog = self._callback_backlog.get(callback)
+        if backlog is None:
+            backlog = self._callback_backlog[callback] = deque(maxlen=CALLBACK_BACKLOG_SIZE)
+        if len(backlog) == CALLBACK_BACKLOG_SIZE:
+            self.dropped_klines += 1
+            if self.dropped_klines % 1000 == 1:
+                logger.warning(f"⚠️ {where}: очередь свечей переполнена, вытеснено {self.dropped_klines}")
+        backlog.append((symbol, kline, where))
+
+    async def _run_callback(self, callback: Callable, symbol: str, kline: Kline, where: str) -> None:
+        """Вызовы одного callback строго по очереди: текущая свеча, затем накопленные"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                started = loop.time()
+                try:
+                    await callback(symbol, kline)
+                except Exception as e:
+                    logger.error(f"Ошибка {where} {symbol}: {e}")
+                elapsed = loop.time() - started
+                if elapsed > self.callback_timeout:
+                    logger.warning(f"⏱ {where} {symbol}: {elapsed:.2f}s, дольше {self.callback_timeout}s")
+                backlog = self._callback_backlog.get(callback)
+                if not backlog:
+                    self._callback_backlog.pop(callback, None)
+                    return
+                symbol, kline, where = backlog.popleft()
+        finally:
+            if self._callback_tasks.get(callback) is asyncio.current_task():
+                del self._callback_tasks[callback]
+
+    async def _start_ticker_ws_subscriptions(self) -> None:
+        """
+        WS ticker stream для символов секундных frame
+
+        Polling цикл по-прежнему выдаёт свечу раз в frame, но берёт последний
+        тикер из push-потока; REST остаётся запасным путём для символов без
+        свежего тикера.
+        """
+        targets = {
+            (category, symbol)
+            for (_frame, category), by_symbol in self.poll_subs.items()
+            for symbol in by_symbol
+        } - self.active_ticker_subscriptions
+        for category, symbol in targets:
+            try:
+                if await self.ws_client.subscribe_ticker(
+                    category=category,
+                    symbol=symbol,
+                    callback=self._ws_ticker_callback(category),
+                ):
+                    self.active_ticker_subscriptions.add((category, symbol))
+            except Exception as e:
+                logger.error(f"Ошибка WS ticker подписки {symbol}[{category}]: {e}")
+        if targets:
+            logger.info(f"✅ WebSocket tickers: {len(self.active_ticker_subscriptions)} активных подписок")
+
+    def _ws_ticker_callback(self, category: str) -> Callable[[str, dict], None]:
+        def on_ticker(symbol: str, ticker: dict) -> None:
+            self._ws_tickers[(category, symbol)] = (time.monotonic(), ticker)
+        return on_ticker
+
+    async def _get_tickers(self, category: str, symbols: list[str]) -> dict[str, dict]:
+        """Тикеры для polling цикла: свежие из WS, недостающие — одним REST запросом"""
+        now = time.monotonic()
+        tickers: dict[str, dict] = {}
+        missing: list[str] = []
+        for symbol in symbols:
+            cached = self._ws_tickers.get((category, symbol))
+            if cached is not None and now - cached[0] < WS_TICKER_MAX_AGE:
+                tickers[symbol] = cached[1]
+            else:
+                missing.append(symbol)
+        if missing:
+            tickers.update(await self.rest_client.get_tickers_batch(category, missing))
+        return tickers
 
     # ===== Polling =====
     async def _start_polling_tasks(self) -> None:
-        groups: dict[tuple[str, str], list[SubscriptionRequest]] = {}
-        for subs in self.subscriptions.values():
-            for s in subs:
-                if s.source_type == "polling":
-                    key = (s.frame, s.market_category)
-                    groups.setdefault(key, []).append(s)
-        if not groups:
+        if not self.poll_subs:
             logger.info("Нет polling задач для запуска")
             return
-        logger.info(f"Запуск {len(groups)} polling задач...")
+        logger.info(f"Запуск {len(self.poll_subs)} polling задач...")
         self.polling_active = True
-        for (frame, category), subs in groups.items():
-            interval = self._frame_to_seconds(frame)
+        for (frame, category), subs_by_symbol in self.poll_subs.items():
+            interval = frame_to_seconds(frame)
             task_key = (frame, category)
             task = asyncio.create_task(
-                self._polling_loop(frame, category, subs, interval),
+                self._polling_loop(frame, category, subs_by_symbol, interval),
                 name=f"polling_{frame}_{category}",
             )
             self.polling_tasks[task_key] = task
-            uniq = {s.symbol for s in subs}
-            logger.info(f"   📡 {frame} [{category}] ({interval}s): {len(uniq)} пар, {len(subs)} подписок")
+            subs_count = sum(len(subs) for subs in subs_by_symbol.values())
+            logger.info(f"   📡 {frame} [{category}] ({interval}s): {len(subs_by_symbol)} пар, {subs_count} подписок")
         logger.info(f"✅ Polling: {len(self.polling_tasks)} задач активно")
 
     async def _stop_polling_tasks(self) -> None:
         self.polling_active = False
-        for _, task in list(self.polling_tasks.items()):
-            if not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+        tasks = [task for task in self.polling_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        # Ждём отмену всех задач разом, а не по очереди
+        await asyncio.gather(*tasks, return_exceptions=True)
         self.polling_tasks.clear()
-        self.last_poll_times.clear()
+        self._kline_cache.clear()
         logger.info("✅ Все polling задачи остановлены")
 
     async def _polling_loop(
         self,
         frame: str,
         category: str,
-        subscriptions: list[SubscriptionRequest],
+        subs_by_symbol: dict[str, SubBucket],
         interval_seconds: int,
     ) -> None:
-        key = (frame, category)
+        """Опрос группы (frame, category); subs_by_symbol — живой индекс из self.poll_subs"""
+        # Дедлайны по монотонным часам loop: без дрейфа и без скачков от NTP
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
+        # Локальные ссылки: горячий цикл не перечитывает атрибуты self на каждый тикер
+        get_tickers = self._get_tickers
+        kline_from_ticker = self._kline_from_ticker
+        dispatch = self._dispatch
+        subs_for = subs_by_symbol.get
+        error_streak = 0
         while self.polling_active:
             try:
-                now = time.time()
-                last = self.last_poll_times.get(key, 0)
-                if now - last < interval_seconds:
-                    await asyncio.sleep(max(0, interval_seconds - (now - last)))
-                uniq = {s.symbol for s in subscriptions}
-                for symbol in uniq:
+                # Тикеры из WS ticker stream; REST (один запрос на цикл) только для недостающих
+                tickers = await get_tickers(category, list(subs_by_symbol))
+                now_ms = time.time_ns() // 1_000_000
+                tasks: list[asyncio.Task] = []
+                for symbol, ticker in tickers.items():
                     try:
-                        ticker = await self.rest_client.get_ticker(
-                            category=category,
-                            symbol=symbol,
-                        )
-                        if ticker:
-                            kline = self._ticker_to_kline(ticker)
-                            await self._distribute_polling_data(symbol, frame, category, kline, subscriptions)
+                        kline = kline_from_ticker(category, symbol, ticker, now_ms)
+                        tasks += dispatch(subs_for(symbol), symbol, kline, "polling")
                     except Exception as e:
                         logger.error(f"Ошибка polling {symbol} @ {frame}[{category}]: {e}")
-                self.last_poll_times[key] = time.time()
+                # Один общий callback_timeout на цикл, а не на каждую пару
+                if tasks:
+                    await asyncio.wait(tasks, timeout=self.callback_timeout)
+                error_streak = 0
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Ошибка в polling цикле {frame}[{category}]: {e}")
-                await asyncio.sleep(5)
+                delay = backoff_delay(error_streak, POLL_ERROR_BASE_DELAY, POLL_ERROR_MAX_DELAY)
+                error_streak += 1
+                logger.error(f"Ошибка в polling цикле {frame}[{category}]: {e}, пауза {delay:.2f}s")
+                await asyncio.sleep(delay)
 
-    async def _distribute_polling_data(
-        self,
-        symbol: str,
-        frame: str,
-        category: str,
-        kline: Kline,
-        subscriptions: list[SubscriptionRequest],
-    ) -> None:
-        for s in subscriptions:
-            if s.symbol == symbol and s.frame == frame and s.market_category == category:
-                try:
-                    await s.callback(symbol, kline)
-                except Exception as e:
-                    logger.error(f"Ошибка polling callback [{s.strategy_name}] {symbol}@{frame}[{category}]: {e}")
+            next_poll += interval_seconds
+            now = loop.time()
+            if next_poll < now:
+                # Цикл не уложился в интервал: пропущенные тики не догоняем
+                next_poll = now
+            await asyncio.sleep(next_poll - now)
+
+    async def _activation_worker_loop(self) -> None:
+        """
+        Последовательная активация подписок новых стратегий; None — сигнал остановки
+
+        Стратегии, накопившиеся в очереди за время предыдущей активации (пачка
+        register_strategy), активируются одним проходом, а не по проходу на каждую.
+        """
+        queue = self._activation_queue
+        stopping = False
+        while not stopping:
+            names = [await queue.get()]
+            while not queue.empty():
+                names.append(queue.get_nowait())
+            stopping = None in names
+            batch = ", ".join(name for name in names if name is not None)
+            try:
+                if batch:
+                    await self._activate_new_subscriptions(batch)
+            except Exception as e:
+                logger.error(f"[{batch}] Ошибка активации подписок: {e}")
+            finally:
+                for _ in names:
+                    queue.task_done()
+
+    async def _stop_activation_worker(self) -> None:
+        """Дождаться уже поставленных в очередь активаций и завершить worker"""
+        worker, self._activation_worker = self._activation_worker, None
+        if worker is None:
+            return
+        self._activation_queue.put_nowait(None)
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
 
     async def _activate_new_subscriptions(self, strategy_name: str) -> None:
         logger.info(f"[{strategy_name}] 🔄 Активация подписок...")
         await self._start_websocket_subscriptions()
+        await self._start_ticker_ws_subscriptions()
         logger.info(f"[{strategy_name}] ✅ Подписки активированы")
 
-    @staticmethod
-    def _ticker_to_kline(ticker_data: dict) -> Kline:
-        if "result" in ticker_data and "list" in ticker_data["result"]:
-            t = ticker_data["result"]["list"][0]
-        else:
-            t = ticker_data
-        last_price = float(t.get("lastPrice", 0))
-        high_price = float(t.get("highPrice24h", last_price))
-        low_price = float(t.get("lowPrice24h", last_price))
-        volume = float(t.get("volume24h", 0))
-        return Kline(
-            timestamp=int(time.time() * 1000),
-            open=last_price,
-            high=high_price,
-            low=low_price,
-            close=last_price,
-            volume=volume,
-            confirm=True,
-        )
-
-    @staticmethod
-    def _frame_to_seconds(frame: str) -> int:
-        if frame.endswith("s"):
-            return int(frame[:-1])
-        if frame == "D":
-            return 86400
-        if frame == "W":
-            return 604800
-        if frame == "M":
-            return 2592000
-        return int(frame) * 60
+    def _kline_from_ticker(self, category: str, symbol: str, ticker: dict, timestamp_ms: int | None = None) -> Kline:
+        """
+        Свеча из тикера; тот же объект тикера с той же меткой цикла (общий кэш
+        get_tickers_batch для циклов одной категории) отдаёт уже построенную Kline
+        без новой аллокации. Тикер из WS для тихого символа живёт дольше цикла,
+        поэтому метка времени входит в проверку — иначе свеча ушла бы со старым timestamp.
+        """
+        if timestamp_ms is None:
+            timestamp_ms = time.time_ns() // 1_000_000
+        key = (category, symbol)
+        cached = self._kline_cache.get(key)
+        if cached is not None and cached[0] is ticker and cached[1].timestamp == timestamp_ms:
+            return cached[1]
+        kline = ticker_to_kline(ticker, timestamp_ms)
+        self._kline_cache[key] = (ticker, kline)
+        return kline
 
     def get_stats(self) -> dict:
-        polling = sum(len([s for s in subs if s.source_type == "polling"]) for subs in self.subscriptions.values())
-        websocket = sum(len([s for s in subs if s.source_type == "websocket"]) for subs in self.subscriptions.values())
-        by_cat: dict[str, int] = {}
-        for (_sym, _frame, cat), subs in self.subscriptions.items():
-            by_cat[cat] = by_cat.get(cat, 0) + len(subs)
         return {
             "registered_strategies": len(self.registered_strategies),
             "total_keys": len(self.subscriptions),
-            "subs_by_category": by_cat,
-            "polling_subscriptions": polling,
-            "websocket_subscriptions": websocket,
+            "subs_by_category": dict(self._subs_by_category),
+            "polling_subscriptions": self._polling_count,
+            "websocket_subscriptions": self._websocket_count,
             "active_ws_subscriptions": len(self.active_ws_subscriptions),
             "active_polling_tasks": len(self.polling_tasks),
             "is_running": self.is_running,
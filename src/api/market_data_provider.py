@@ -8,17 +8,22 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import time
+from collections import defaultdict
 from typing import Callable
 
 from ..logger import get_app_logger
 from ..config import StrategyConfig, SignalConfig
-from .bybit_client import BybitClient
+from .bybit_client import BybitClient, backoff_delay
 from .bybit_websocket_client import BybitWebSocketClient
-from .common import Kline
+from .common import POLL_ERROR_BASE_DELAY, POLL_ERROR_MAX_DELAY, Kline, frame_to_seconds, ticker_to_kline
 
 logger = get_app_logger()
 
+# Свечи, ожидающие callback стратегии; при переполнении вытесняются самые старые
+CALLBACK_QUEUE_SIZE = 1024
+
 
 class MultiMarketDataProvider:
     """
@@ -38,6 +43,8 @@ class MultiMarketDataProvider:
         self.strategy_config = strategy_config
         self.rest_client = rest_client
         self.ws_client = ws_client
+        # Категория рынка стратегии не меняется: резолвим один раз, а не на каждый опрос
+        self.market_category = strategy_config.get_market_category()
         
         # Колбэк для передачи данных в стратегию
         self.kline_callback: Callable[[str, Kline], None] | None = None
@@ -52,8 +59,13 @@ class MultiMarketDataProvider:
         self.polling_tasks: dict[str, asyncio.Task] = {}
         self.polling_active = False
         
-        # Кеш последних данных для каждой пары
-        self.last_poll_times: dict[str, float] = {}
+        # Уникальные пары каждого polling frame: набор фиксирован на время жизни провайдера
+        self._frame_symbols: dict[str, list[str]] = {}
+        
+        # Очередь свечей для callback: источники не ждут обработку стратегией
+        self._kline_queue: asyncio.Queue[tuple[str, Kline]] = asyncio.Queue(maxsize=CALLBACK_QUEUE_SIZE)
+        self._consumer_task: asyncio.Task | None = None
+        self.dropped_klines: int = 0
         
         logger.info(f"[{strategy_config.name}] MultiMarketDataProvider инициализирован")
         logger.info(f"   Polling сигналы: {len(self.polling_signals)}")
@@ -85,6 +97,9 @@ class MultiMarketDataProvider:
     async def start(self):
         """Запуск всех источников данных"""
         
+        if self._consumer_task is None or self._consumer_task.done():
+            self._consumer_task = asyncio.create_task(self._consume(), name="kline_consumer")
+        
         # Запускаем WebSocket подписки
         await self._start_websocket_subscriptions()
         
@@ -99,6 +114,14 @@ class MultiMarketDataProvider:
         # Останавливаем polling
         await self._stop_polling_tasks()
         
+        consumer, self._consumer_task = self._consumer_task, None
+        if consumer is not None and not consumer.done():
+            consumer.cancel()
+            try:
+                await consumer
+            except asyncio.CancelledError:
+                pass
+        
         logger.info(f"[{self.strategy_config.name}] ✅ Провайдер данных остановлен")
 
     # ========== WebSocket подписки ==========
@@ -123,26 +146,53 @@ class MultiMarketDataProvider:
             for trade_pair in self.strategy_config.trade_pairs:
                 subscriptions.add((trade_pair, signal_config.frame))
         
-        # Выполняем подписки
-        for symbol, interval in subscriptions:
-            try:
-                self.ws_client.subscribe_kline(
-                    category=self.strategy_config.get_market_category(),
-                    symbol=symbol,
-                    interval=interval,
-                    callback=self._ws_callback
-                )
-                logger.debug(f"   ✓ WS подписка: {symbol} @ {interval}")
-                
-            except Exception as e:
-                logger.error(f"[{self.strategy_config.name}] Ошибка WS подписки {symbol}@{interval}: {e}")
+        # Один bulk вызов: новые топики уходят общими subscribe-фреймами,
+        # уже активные в ws_client (другие стратегии) только получают callback
+        try:
+            subscribed = await self.ws_client.subscribe_klines_bulk(
+                category=self.market_category,
+                pairs=sorted(subscriptions),
+                callback=self._ws_callback,
+            )
+        except Exception as e:
+            logger.error(f"[{self.strategy_config.name}] Ошибка WS подписки ({len(subscriptions)} топиков): {e}")
+            subscribed = set()
         
-        logger.info(f"[{self.strategy_config.name}] ✅ WebSocket: {len(subscriptions)} подписок активно")
+        for symbol, interval in subscriptions - subscribed:
+            logger.error(f"[{self.strategy_config.name}] Ошибка WS подписки {symbol}@{interval}")
+        
+        logger.info(f"[{self.strategy_config.name}] ✅ WebSocket: {len(subscribed)} подписок активно")
 
     async def _ws_callback(self, symbol: str, kline: Kline):
         """Callback для WebSocket данных"""
-        if self.kline_callback and kline.confirm:
-            await self.kline_callback(symbol, kline)
+        if kline.confirm:
+            self._enqueue(symbol, kline)
+
+    def _enqueue(self, symbol: str, kline: Kline) -> None:
+        """Кладёт свечу в очередь callback; при переполнении вытесняет самую старую"""
+        queue = self._kline_queue
+        if queue.full():
+            queue.get_nowait()
+            self.dropped_klines += 1
+            if self.dropped_klines % 1000 == 1:
+                logger.warning(
+                    f"[{self.strategy_config.name}] ⚠️ Очередь свечей переполнена, "
+                    f"вытеснено {self.dropped_klines}"
+                )
+        queue.put_nowait((symbol, kline))
+
+    async def _consume(self) -> None:
+        """Единственный потребитель очереди: вызывает callback стратегии по порядку"""
+        queue = self._kline_queue
+        while True:
+            symbol, kline = await queue.get()
+            callback = self.kline_callback
+            if callback is None:
+                continue
+            try:
+                await callback(symbol, kline)
+            except Exception as e:
+                logger.error(f"[{self.strategy_config.name}] Ошибка callback {symbol}: {e}")
 
     # ========== REST Polling ==========
     
@@ -158,24 +208,20 @@ class MultiMarketDataProvider:
         self.polling_active = True
         
         # Группируем сигналы по интервалу для оптимизации
-        interval_groups: dict[str, list[SignalConfig]] = {}
+        interval_groups: dict[str, list[SignalConfig]] = defaultdict(list)
         for signal_config in self.polling_signals.values():
-            if signal_config.frame not in interval_groups:
-                interval_groups[signal_config.frame] = []
             interval_groups[signal_config.frame].append(signal_config)
         
-        # Создаем задачу для каждого уникального интервала
         for frame, signal_configs in interval_groups.items():
-            interval_seconds = self._frame_to_seconds(frame)
-            
-            task_name = f"polling_{frame}"
-            task = asyncio.create_task(
-                self._polling_loop(frame, signal_configs, interval_seconds),
-                name=task_name
-            )
-            self.polling_tasks[task_name] = task
-            
-            logger.info(f"   📡 Polling {frame} ({interval_seconds}s): {len(signal_configs)} сигналов")
+            self._frame_symbols[frame] = self._collect_symbols(signal_configs)
+            logger.info(f"   📡 Polling {frame} ({frame_to_seconds(frame)}s): {len(signal_configs)} сигналов")
+        
+        # Одна задача на все интервалы: планировщик по ближайшему дедлайну
+        task_name = "polling"
+        self.polling_tasks[task_name] = asyncio.create_task(
+            self._polling_loop(dict(interval_groups)),
+            name=task_name
+        )
         
         logger.info(f"[{self.strategy_config.name}] ✅ Polling: {len(self.polling_tasks)} задач запущено")
 
@@ -195,99 +241,73 @@ class MultiMarketDataProvider:
         self.polling_tasks.clear()
         logger.info(f"[{self.strategy_config.name}] Polling задачи остановлены")
 
-    async def _polling_loop(
-        self, 
-        frame: str, 
-        signal_configs: list[SignalConfig],
-        interval_seconds: int
-    ):
-        """Основной цикл polling для конкретного интервала"""
+    async def _polling_loop(self, interval_groups: dict[str, list[SignalConfig]]):
+        """
+        Общий цикл polling всех интервалов
+
+        Куча (дедлайн, интервал, frame): цикл спит до ближайшего дедлайна,
+        опрашивает этот frame и планирует его следующий опрос.
+        """
         
+        # Дедлайны по монотонным часам loop: без дрейфа и без скачков от NTP
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        heap = [(start, frame_to_seconds(frame), frame) for frame in interval_groups]
+        heapq.heapify(heap)
+        error_streak = 0
         while self.polling_active:
+            deadline, interval_seconds, frame = heapq.heappop(heap)
             try:
-                # Rate limiting
-                now = time.time()
-                last_poll = self.last_poll_times.get(frame, 0)
-                
-                if now - last_poll < interval_seconds:
-                    await asyncio.sleep(interval_seconds - (now - last_poll))
-                
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
                 # Получаем данные для всех пар этого интервала
-                await self._poll_frame_data(frame, signal_configs)
-                
-                self.last_poll_times[frame] = time.time()
+                await self._poll_frame_data(frame, interval_groups[frame])
+                error_streak = 0
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"[{self.strategy_config.name}] Polling ошибка {frame}: {e}")
-                await asyncio.sleep(5)
+                delay = backoff_delay(error_streak, POLL_ERROR_BASE_DELAY, POLL_ERROR_MAX_DELAY)
+                error_streak += 1
+                logger.error(f"[{self.strategy_config.name}] Polling ошибка {frame}: {e}, пауза {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+            deadline += interval_seconds
+            now = loop.time()
+            if deadline < now:
+                # Опрос не уложился в интервал: пропущенные тики не догоняем
+                deadline = now
+            heapq.heappush(heap, (deadline, interval_seconds, frame))
+
+    def _collect_symbols(self, signal_configs: list[SignalConfig]) -> list[str]:
+        """Уникальные пары frame: index пары сигналов и все торговые пары стратегии"""
+        return list({sig.index for sig in signal_configs} | set(self.strategy_config.trade_pairs))
 
     async def _poll_frame_data(self, frame: str, signal_configs: list[SignalConfig]):
         """Получение данных через REST для конкретного frame"""
         
-        # Собираем уникальные пары для этого frame
-        unique_symbols: set[str] = set()
-        
-        for signal_config in signal_configs:
-            unique_symbols.add(signal_config.index)
-            for trade_pair in self.strategy_config.trade_pairs:
-                unique_symbols.add(trade_pair)
-        
-        # Получаем ticker для каждой уникальной пары
-        for symbol in unique_symbols:
-            try:
-                ticker = await self.rest_client.get_ticker(
-                    category=self.strategy_config.get_market_category(),
-                    symbol=symbol
-                )
-                
-                if ticker:
-                    # Конвертируем ticker в Kline и отправляем в callback
-                    kline = self._ticker_to_kline(ticker)
-                    if self.kline_callback:
-                        await self.kline_callback(symbol, kline)
-                        
-            except Exception as e:
-                logger.error(f"[{self.strategy_config.name}] Ошибка получения {symbol} @ {frame}: {e}")
-
-    @staticmethod
-    def _ticker_to_kline(ticker_data: dict) -> Kline:
-        """Конвертация ticker в Kline объект"""
+        unique_symbols = self._frame_symbols.get(frame)
+        if unique_symbols is None:
+            unique_symbols = self._frame_symbols[frame] = self._collect_symbols(signal_configs)
         
-        # Извлекаем данные из ответа API
-        if 'result' in ticker_data and 'list' in ticker_data['result']:
-            ticker = ticker_data['result']['list'][0]
-        else:
-            ticker = ticker_data
-            
-        last_price = float(ticker.get("lastPrice", 0))
-        high_price = float(ticker.get("highPrice24h", last_price))
-        low_price = float(ticker.get("lowPrice24h", last_price))
-        volume = float(ticker.get("volume24h", 0))
-
-        return Kline(
-            timestamp=int(time.time() * 1000),
-            open=last_price,  # Для polling используем последнюю цену
-            high=high_price,
-            low=low_price,
-            close=last_price,
-            volume=volume,
-            confirm=True  # Всегда подтвержденная для polling
+        # Один запрос на всю категорию вместо запроса на каждую пару;
+        # ошибка запроса уходит в _polling_loop, который отвечает backoff
+        tickers = await self.rest_client.get_tickers_batch(
+            category=self.market_category,
+            symbols=unique_symbols,
         )
 
-    @staticmethod  
-    def _frame_to_seconds(frame: str) -> int:
-        """Конвертация frame в секунды"""
-        if frame.endswith("s"):
-            return int(frame[:-1])
-        if frame == "D":
-            return 86400
-        if frame == "W":
-            return 604800  
-        if frame == "M":
-            return 2592000
-        return int(frame) * 60
+        # Одна метка времени на цикл и локальная ссылка на enqueue для всех пар
+        now_ms = time.time_ns() // 1_000_000
+        enqueue = self._enqueue
+        for symbol, ticker in tickers.items():
+            try:
+                # Конвертируем ticker в Kline и ставим в очередь callback
+                enqueue(symbol, ticker_to_kline(ticker, now_ms))
+
+            except Exception as e:
+                logger.error(f"[{self.strategy_config.name}] Ошибка обработки {symbol} @ {frame}: {e}")
 
 
 # Сохраняем старый MarketDataProvider для обратной совместимости
@@ -319,7 +339,6 @@ class MarketDataProvider:
         # Для polling режима
         self.polling_task: asyncio.Task | None = None
         self.polling_active = False
-        self.last_poll_time = 0
         self.poll_interval = config.get_polling_interval_seconds()
 
         # Callbacks
@@ -358,23 +377,27 @@ class MarketDataProvider:
         """Запуск WebSocket подписок"""
         logger.info(f"[{self.config.name}] Starting WebSocket subscriptions...")
 
-        # Подписка на доминирующую пару
-        self.ws_client.subscribe_kline(
-            category=self.config.get_market_category(),
-            symbol=self.config.dominant_pair,
-            interval=self.config.timeframe,
-            callback=self._ws_dominant_callback
-        )
-
-        # Подписка на целевую пару
-        self.ws_client.subscribe_kline(
-            category=self.config.get_market_category(),
-            symbol=self.config.target_pair,
-            interval=self.config.timeframe,
-            callback=self._ws_target_callback
+        category = self.config.get_market_category()
+        # Подписки на доминирующую и целевую пары (subscribe_kline — корутина)
+        results = await asyncio.gather(
+            self.ws_client.subscribe_kline(
+                category=category,
+                symbol=self.config.dominant_pair,
+                interval=self.config.timeframe,
+                callback=self._ws_dominant_callback
+            ),
+            self.ws_client.subscribe_kline(
+                category=category,
+                symbol=self.config.target_pair,
+                interval=self.config.timeframe,
+                callback=self._ws_target_callback
+            ),
         )
 
-        logger.info(f"[{self.config.name}] ✅ WebSocket subscriptions active")
+        if all(results):
+            logger.info(f"[{self.config.name}] ✅ WebSocket subscriptions active")
+        else:
+            logger.error(f"[{self.config.name}] WebSocket subscription failed")
 
     async def _ws_dominant_callback(self, symbol: str, kline: Kline):
         """Обработка kline доминирующей пары из WebSocket"""
@@ -415,73 +438,48 @@ class MarketDataProvider:
 
     async def _polling_loop(self):
         """Основной цикл polling"""
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
+        error_streak = 0
         while self.polling_active:
             try:
-                # Проверяем rate limiting
-                now = time.time()
-                time_since_last = now - self.last_poll_time
-
-                if time_since_last < self.poll_interval:
-                    await asyncio.sleep(self.poll_interval - time_since_last)
-
                 # Получаем тикеры (текущие цены)
                 await self._poll_tickers()
-
-                self.last_poll_time = time.time()
+                error_streak = 0
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"[{self.config.name}] Polling error: {e}")
-                await asyncio.sleep(5)
+                delay = backoff_delay(error_streak, POLL_ERROR_BASE_DELAY, POLL_ERROR_MAX_DELAY)
+                error_streak += 1
+                logger.error(f"[{self.config.name}] Polling error: {e}, retry in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+            next_poll += self.poll_interval
+            now = loop.time()
+            if next_poll < now:
+                next_poll = now
+            await asyncio.sleep(next_poll - now)
 
     async def _poll_tickers(self):
         """Получение текущих цен через REST API"""
-        try:
-            # Получаем тикеры для обеих пар одновременно
-            dominant_ticker = await self.rest_client.get_ticker(
-                category=self.config.get_market_category(),
-                symbol=self.config.dominant_pair
-            )
-
-            target_ticker = await self.rest_client.get_ticker(
-                category=self.config.get_market_category(),
-                symbol=self.config.target_pair
-            )
-
-            # Конвертируем в Kline формат и вызываем callbacks
-            if dominant_ticker and self.dominant_callback:
-                kline = self._ticker_to_kline(dominant_ticker)
-                await self.dominant_callback(self.config.dominant_pair, kline)
-
-            if target_ticker and self.target_callback:
-                kline = self._ticker_to_kline(target_ticker)
-                await self.target_callback(self.config.target_pair, kline)
-
-        except Exception as e:
-            logger.error(f"[{self.config.name}] Error polling tickers: {e}")
-
-    @staticmethod
-    def _ticker_to_kline(ticker: dict) -> Kline:
-        """Конвертация ticker в Kline объект"""
-        
-        # Извлекаем данные из ответа API
-        if 'result' in ticker and 'list' in ticker['result']:
-            ticker_data = ticker['result']['list'][0]
-        else:
-            ticker_data = ticker
-            
-        last_price = float(ticker_data.get("lastPrice", 0))
-        high_price = float(ticker_data.get("highPrice24h", last_price))
-        low_price = float(ticker_data.get("lowPrice24h", last_price))
-        volume = float(ticker_data.get("volume24h", 0))
-
-        return Kline(
-            timestamp=int(time.time() * 1000),
-            open=last_price,  # Для polling используем последнюю цену
-            high=high_price,
-            low=low_price,
-            close=last_price,
-            volume=volume,
-            confirm=True  # Всегда подтвержденная для polling
-        )
\ No newline at end of file
+        category = self.config.get_market_category()
+        # Запросы обеих пар идут параллельно: цикл ждёт один RTT, а не два
+        results = await asyncio.gather(
+            self.rest_client.get_ticker(category=category, symbol=self.config.dominant_pair),
+            self.rest_client.get_ticker(category=category, symbol=self.config.target_pair),
+            return_exceptions=True,
+        )
+        for symbol, ticker, callback in zip(
+            (self.config.dominant_pair, self.config.target_pair),
+            results,
+            (self.dominant_callback, self.target_callback),
+        ):
+            try:
+                if isinstance(ticker, Exception):
+                    raise ticker
+                # Конвертируем в Kline формат и вызываем callback
+                if ticker and callback:
+                    await callback(symbol, ticker_to_kline(ticker))
+            except Exception as e:
+                logger.error(f"[{self.config.name}] Error polling ticker {symbol}: {e}")
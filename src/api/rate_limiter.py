@@ -0,0 +1,48 @@
+"""
+Token-bucket ограничитель частоты запросов к Bybit REST
+
+Токены пополняются непрерывно со скоростью rate в секунду до ёмкости cap.
+Запрос с ценой cost ждёт, пока в ведре не накопится нужное число токенов.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """Асинхронное ведро токенов с переменной ценой запроса"""
+
+    __slots__ = ("rate", "cap", "tokens", "last", "lock")
+
+    def __init__(self, rate: float, cap: float):
+        self.rate = float(rate)
+        self.cap = float(cap)
+        self.tokens = float(cap)
+        self.last = time.monotonic()
+        # Lock выстраивает ожидающих в очередь, чтобы не было гонки за токены
+        self.lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.cap, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    async def acquire(self, cost: float = 1) -> None:
+        """Дождаться cost токенов и списать их"""
+        async with self.lock:
+            self._refill()
+            if self.tokens < cost:
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= cost
+
+    def penalize(self, seconds: float) -> None:
+        """
+        Остановить выдачу токенов на seconds (ответ 429 от биржи)
+
+        Баланс уходит в минус: следующие acquire ждут, пока ведро не
+        пополнится, вместо того чтобы сразу получить ещё один 429.
+        """
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
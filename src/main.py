@@ -4,7 +4,9 @@ import asyncio
 import signal
 from datetime import datetime
 
-from src.api.bybit_client import BybitClient
+import uvloop
+
+from src.api.bybit_client import BybitClient, get_client
 from src.api.bybit_websocket_client import BybitWebSocketClient
 from src.api.global_market_data_manager import GlobalMarketDataManager
 from src.config import Config
@@ -19,26 +21,33 @@ from src.trading.position_manager import PositionManager
 logger = get_app_logger()
 
 class TradingBot:
-    def __init__(self, config_path: str = "config/config.json") -> None:
+    @classmethod
+    async def create(cls, config_path: str = "config/config.json") -> TradingBot:
+        """Сборка бота с общим на процесс BybitClient из get_client"""
         # Загружаем конфигурацию раньше, чтобы сконфигурировать логгер
-        self.config = Config.load(config_path)
+        config = Config.load(config_path)
 
         # Конфигурируем логгер из конфигурации
         # Дополнительно уважаем переменные окружения, если заданы
         setup_logger(
-            name=getattr(self.config, "log_name", None),
-            level=self.config.logging_level,
-            log_dir=getattr(self.config, "log_dir", None),
-            log_file=getattr(self.config, "log_file", None),
-            err_file=getattr(self.config, "log_error_file", None),
+            name=getattr(config, "log_name", None),
+            level=config.logging_level,
+            log_dir=getattr(config, "log_dir", None),
+            log_file=getattr(config, "log_file", None),
+            err_file=getattr(config, "log_error_file", None),
         )
 
-        self.client = BybitClient(
-            api_key=self.config.api_key,
-            api_secret=self.config.api_secret,
-            testnet=self.config.testnet,
-            demo=self.config.demo_mode,
+        client = await get_client(
+            api_key=config.api_key,
+            api_secret=config.api_secret,
+            testnet=config.testnet,
+            demo=config.demo_mode,
         )
+        return cls(config, client)
+
+    def __init__(self, config: Config, client: BybitClient) -> None:
+        self.config = config
+        self.client = client
 
         self.ws_client = BybitWebSocketClient(
             api_key=self.config.api_key,
@@ -101,6 +110,7 @@ class TradingBot:
 
     async def _initialize(self) -> None:
         logger.info("Initializing components...")
+        await self.client.start()
         try:
             await self.ws_client.connect()
         except Exception as e:
@@ -246,9 +256,10 @@ class TradingBot:
 
 
 def main() -> None:
-    loop = asyncio.new_event_loop()
+    # uvloop: быстрее stdlib loop на сокетах и планировании callbacks
+    loop = uvloop.new_event_loop()
     asyncio.set_event_loop(loop)
-    bot = TradingBot("config/config.json")
+    bot = loop.run_until_complete(TradingBot.create("config/config.json"))
 
     def signal_handler(signum: int, frame: object) -> None:
         logger.info(f"\nReceived signal {signum}")
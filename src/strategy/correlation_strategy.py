@@ -100,18 +100,19 @@ class CorrelationStrategy:
             # Для tick_window=0 загружаем только последнюю закрытую свечу
             logger.info(f"[{self.config.name}] Using last candle only (tick_window=0)")
 
-            dominant_klines = await self.rest_client.get_klines(
-                category=self.config.get_market_category(),
-                symbol=self.config.dominant_pair,
-                interval=self.config.timeframe,
-                limit=2  # Последняя и текущая
-            )
-
-            target_klines = await self.rest_client.get_klines(
-                category=self.config.get_market_category(),
-                symbol=self.config.target_pair,
-                interval=self.config.timeframe,
-                limit=2
+            dominant_klines, target_klines = await asyncio.gather(
+                self.rest_client.get_klines(
+                    category=self.config.get_market_category(),
+                    symbol=self.config.dominant_pair,
+                    interval=self.config.timeframe,
+                    limit=2  # Последняя и текущая
+                ),
+                self.rest_client.get_klines(
+                    category=self.config.get_market_category(),
+                    symbol=self.config.target_pair,
+                    interval=self.config.timeframe,
+                    limit=2
+                ),
             )
 
             if not dominant_klines or not target_klines:
@@ -131,18 +132,19 @@ class CorrelationStrategy:
             # Стандартная загрузка n-1 свечей
             logger.info(f"[{self.config.name}] 📥 Loading {self.config.tick_window} candles...")
 
-            dominant_klines = await self.rest_client.get_klines(
-                category=self.config.get_market_category(),
-                symbol=self.config.dominant_pair,
-                interval=self.config.timeframe,
-                limit=self.config.tick_window
-            )
-
-            target_klines = await self.rest_client.get_klines(
-                category=self.config.get_market_category(),
-                symbol=self.config.target_pair,
-                interval=self.config.timeframe,
-                limit=self.config.tick_window
+            dominant_klines, target_klines = await asyncio.gather(
+                self.rest_client.get_klines(
+                    category=self.config.get_market_category(),
+                    symbol=self.config.dominant_pair,
+                    interval=self.config.timeframe,
+                    limit=self.config.tick_window
+                ),
+                self.rest_client.get_klines(
+                    category=self.config.get_market_category(),
+                    symbol=self.config.target_pair,
+                    interval=self.config.timeframe,
+                    limit=self.config.tick_window
+                ),
             )
 
             if not dominant_klines or not target_klines:
@@ -94,65 +94,68 @@ class MultiSignalStrategy:
 
     async def preload_history(self) -> bool:
         logger.info(f"[{self.config.name}] 📅 Загрузка исторических данных (per-signal frame)...")
-        
-        for signal_name, signal_config in self.config.signals.items():
-            try:
-                limit = max(signal_config.tick_window, 2) if signal_config.tick_window > 0 else 2
-                frame = signal_config.frame
-                
-                # Загружаем index с соответствующим frame
-                index_klines = await self.rest_client.get_klines(
-                    category=self.config.get_pair_category(signal_config.index),
-                    symbol=signal_config.index,
+
+        # Сигналы независимы — грузим параллельно, ошибки изолированы внутри каждого
+        await asyncio.gather(*(
+            self._preload_signal(signal_name, signal_config)
+            for signal_name, signal_config in self.config.signals.items()
+        ))
+
+        self.history_loaded = True
+        return True
+
+    async def _preload_signal(self, signal_name: str, signal_config: SignalConfig) -> None:
+        try:
+            limit = max(signal_config.tick_window, 2) if signal_config.tick_window > 0 else 2
+            frame = signal_config.frame
+
+            # index и target пары с тем же frame — одним параллельным запросом
+            symbols = [signal_config.index, *self.config.trade_pairs]
+            loaded = await asyncio.gather(*(
+                self.rest_client.get_klines(
+                    category=self.config.get_pair_category(symbol),
+                    symbol=symbol,
                     interval=frame,
                     limit=limit,
                 )
-                
-                if not index_klines:
-                    logger.error(f"[{self.config.name}] Не удалось загрузить index {signal_config.index} @ {frame}")
-                    continue
-                
-                # Загружаем target пары с тем же frame
-                target_klines_data: dict[str, list[Kline]] = {}
-                for trade_pair in self.config.trade_pairs:
-                    kl = await self.rest_client.get_klines(
-                        category=self.config.get_pair_category(trade_pair),
-                        symbol=trade_pair,
-                        interval=frame,
-                        limit=limit,
-                    )
-                    if kl:
-                        target_klines_data[trade_pair] = kl
-                        
-                if not target_klines_data:
-                    logger.error(f"[{self.config.name}] Нет target данных для {signal_name} @ {frame}")
-                    continue
-                    
-                async with self.signal_locks[signal_name]:
-                    frame_buffers = self.signal_buffers[signal_name][frame]
-                    
-                    if signal_config.tick_window > 0:
-                        # Заполняем всё окно кроме последней свечи
-                        for k in index_klines[:-1]:
-                            frame_buffers[signal_config.index].append(k.close)
-                        for pair, kl_list in target_klines_data.items():
-                            for k in kl_list[:-1]:
-                                frame_buffers[pair].append(k.close)
-                    else:
-                        # tick_window=0: берём только предпоследнюю свечу
-                        if len(index_klines) >= 2:
-                            frame_buffers[signal_config.index].append(index_klines[-2].close)
-                        for pair, kl_list in target_klines_data.items():
-                            if len(kl_list) >= 2:
-                                frame_buffers[pair].append(kl_list[-2].close)
-                                
-                logger.info(f"   ✅ {signal_name} ({frame}): index={len(frame_buffers[signal_config.index])}, targets={[len(frame_buffers[p]) for p in self.config.trade_pairs if p in frame_buffers]}")
-                
-            except Exception as e:
-                logger.error(f"[{self.config.name}] Ошибка загрузки истории {signal_name}: {e}")
-                
-        self.history_loaded = True
-        return True
+                for symbol in symbols
+            ))
+            index_klines = loaded[0]
+
+            if not index_klines:
+                logger.error(f"[{self.config.name}] Не удалось загрузить index {signal_config.index} @ {frame}")
+                return
+
+            target_klines_data: dict[str, list[Kline]] = {
+                trade_pair: kl for trade_pair, kl in zip(self.config.trade_pairs, loaded[1:]) if kl
+            }
+
+            if not target_klines_data:
+                logger.error(f"[{self.config.name}] Нет target данных для {signal_name} @ {frame}")
+                return
+
+            async with self.signal_locks[signal_name]:
+                frame_buffers = self.signal_buffers[signal_name][frame]
+
+                if signal_config.tick_window > 0:
+                    # Заполняем всё окно кроме последней свечи
+                    for k in index_klines[:-1]:
+                        frame_buffers[signal_config.index].append(k.close)
+                    for pair, kl_list in target_klines_data.items():
+                        for k in kl_list[:-1]:
+                            frame_buffers[pair].append(k.close)
+                else:
+                    # tick_window=0: берём только предпоследнюю свечу
+                    if len(index_klines) >= 2:
+                        frame_buffers[signal_config.index].append(index_klines[-2].close)
+                    for pair, kl_list in target_klines_data.items():
+                        if len(kl_list) >= 2:
+                            frame_buffers[pair].append(kl_list[-2].close)
+
+            logger.info(f"   ✅ {signal_name} ({frame}): index={len(frame_buffers[signal_config.index])}, targets={[len(frame_buffers[p]) for p in self.config.trade_pairs if p in frame_buffers]}")
+
+        except Exception as e:
+            logger.error(f"[{self.config.name}] Ошибка загрузки истории {signal_name}: {e}")
 
     async def start(self) -> None:
         logger.info(f"[{self.config.name}] ✅ Strategy is listening (via GlobalMarketDataManager)")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 
 from ..api.bybit_client import BybitClient
@@ -49,6 +50,8 @@ class PositionManager:
         logger.info("Setting leverage for all enabled strategies...")
         await self._update_wallet_balance()
         processed_pairs: set[str] = set()
+        # (имя стратегии/пары, символ, плечо) — запросы плеча уходят параллельно
+        leverage_jobs: list[tuple[str, str, int]] = []
 
         for strategy_config in self.config.enabled_strategies.values():
             if not strategy_config.enabled:
@@ -60,18 +63,7 @@ class PositionManager:
                 processed_pairs.add(trade_pair)
                 if strategy_config.is_futures():
                     logger.info(f"  Setting {strategy_config.leverage}x leverage for {trade_pair}")
-                    try:
-                        success = await self.client.set_leverage(
-                            category="linear",
-                            symbol=trade_pair,
-                            leverage=strategy_config.leverage,
-                        )
-                        if success:
-                            logger.info(f"✓ [{strategy_config.name}] {trade_pair} leverage: {strategy_config.leverage}x")
-                        else:
-                            logger.warning(f"✗ [{strategy_config.name}] Failed to set leverage for {trade_pair}")
-                    except Exception as e:
-                        logger.warning(f"  ⚠️ Leverage error for {trade_pair} (continuing): {e}")
+                    leverage_jobs.append((strategy_config.name, trade_pair, strategy_config.leverage))
                 else:
                     logger.info(f"  [{strategy_config.name}] {trade_pair} - spot trading (no leverage)")
 
@@ -82,18 +74,22 @@ class PositionManager:
             processed_pairs.add(pair.target_pair)
             logger.info(f"[{pair.name}] Initializing legacy pair...")
             if pair.is_futures():
-                try:
-                    success = await self.client.set_leverage(
-                        category="linear",
-                        symbol=pair.target_pair,
-                        leverage=pair.leverage,
-                    )
-                    if success:
-                        logger.info(f"✓ [{pair.name}] Leverage: {pair.leverage}x")
-                    else:
-                        logger.warning(f"✗ [{pair.name}] Failed to set leverage")
-                except Exception as e:
-                    logger.warning(f"  ⚠️ Leverage error (continuing): {e}")
+                leverage_jobs.append((pair.name, pair.target_pair, pair.leverage))
+
+        results = await asyncio.gather(
+            *(
+                self.client.set_leverage(category="linear", symbol=symbol, leverage=leverage)
+                for _, symbol, leverage in leverage_jobs
+            ),
+            return_exceptions=True,
+        )
+        for (name, symbol, leverage), success in zip(leverage_jobs, results):
+            if isinstance(success, Exception):
+                logger.warning(f"  ⚠️ Leverage error for {symbol} (continuing): {success}")
+            elif success:
+                logger.info(f"✓ [{name}] {symbol} leverage: {leverage}x")
+            else:
+                logger.warning(f"✗ [{name}] Failed to set leverage for {symbol}")
 
     async def _update_wallet_balance(self) -> None:
         try:
@@ -379,8 +375,11 @@ class PositionManager:
     async def check_positions(self) -> None:
         self._check_auto_reset_stop_loss_streak()
         closed_pairs: list[str] = []
+        positions = await self.client.get_positions_batch(
+            "linear", list({order.symbol for order in self.open_positions.values()})
+        )
         for pair_name, order in self.open_positions.items():
-            position = await self.client.get_position("linear", order.symbol)
+            position = positions.get(order.symbol)
             if position is None or float(position.get("size", 0)) == 0:
                 await self._handle_position_closed(order)
                 closed_pairs.append(pair_name)
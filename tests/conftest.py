@@ -15,6 +15,18 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_singletons():
+    """Сброс Singleton-инстансов, чтобы тесты не делили клиентов и их моки"""
+    from src.api import bybit_client
+    from src.api.common import Singleton
+    Singleton._instances.clear()
+    bybit_client._client = None
+    yield
+    Singleton._instances.clear()
+    bybit_client._client = None
+
+
 @pytest.fixture
 def temp_db():
     """Временная база данных"""
@@ -124,7 +124,7 @@ class TestFullFlow:
         assert len(pm.open_positions) == 1
 
         # 2. Симулируем закрытие позиции
-        mock_client.get_position.return_value = None  # Позиция закрыта
+        mock_client.get_positions_batch.return_value = {}  # Позиция закрыта
         mock_client.get_order_history.return_value = [{
             "orderId": "order_123",
             "orderStatus": "Filled",
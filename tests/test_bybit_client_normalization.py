@@ -36,13 +36,12 @@ class TestBybitClientNormalization(pytest.IsolatedAsyncioTestCase):
     async def test_normalize_order_solusdt_case(self):
         """Тест нормализации для случая SOLUSDT из лога"""
         # Подменяем кэш чтобы не делать HTTP запрос
-        self.client._instrument_cache["linear:SOLUSDT"] = {
+        self.client._instrument_cache["linear:SOLUSDT"] = (float('inf'), {
             "qtyStep": 0.01,
             "minOrderQty": 0.01,
             "tickSize": 0.001,
             "minNotional": 5.0
-        }
-        self.client._instrument_cache_ts["linear:SOLUSDT"] = float('inf')
+        })
         
         # Исходные данные из лога: qty "0.3183", цена ~157
         result = await self.client.normalize_order(
@@ -71,13 +70,12 @@ class TestBybitClientNormalization(pytest.IsolatedAsyncioTestCase):
     async def test_normalize_order_wifusdt_case(self):
         """Тест нормализации для случая WIFUSDT из лога"""
         # Подменяем кэш для WIFUSDT
-        self.client._instrument_cache["linear:WIFUSDT"] = {
+        self.client._instrument_cache["linear:WIFUSDT"] = (float('inf'), {
             "qtyStep": 1.0,
             "minOrderQty": 1.0,
             "tickSize": 0.0001,
             "minNotional": 5.0
-        }
-        self.client._instrument_cache_ts["linear:WIFUSDT"] = float('inf')
+        })
         
         # Исходные данные из лога: qty "240.9639", цена ~0.41
         result = await self.client.normalize_order(
@@ -105,13 +103,12 @@ class TestBybitClientNormalization(pytest.IsolatedAsyncioTestCase):
 
     async def test_normalize_order_min_notional_adjustment(self):
         """Тест коррекции qty для соответствия minNotional"""
-        self.client._instrument_cache["linear:TESTUSDT"] = {
+        self.client._instrument_cache["linear:TESTUSDT"] = (float('inf'), {
             "qtyStep": 0.1,
             "minOrderQty": 0.1,
             "tickSize": 0.01,
             "minNotional": 10.0  # высокий минимальный номинал
-        }
-        self.client._instrument_cache_ts["linear:TESTUSDT"] = float('inf')
+        })
         
         # Маленький position_size который даст qty < minNotional
         result = await self.client.normalize_order(
@@ -79,11 +79,11 @@ class TestGlobalMarketDataManagerPerSignalFrame(pytest.IsolatedAsyncioTestCase):
         self.manager.register_strategy(self.strategy_config, self.callback)
         
         calls = []
-        async def mock_subscribe_kline(category, symbol, interval, callback):
-            calls.append((category, symbol, interval))
-            return True
+        async def mock_subscribe_klines_bulk(category, pairs, callback):
+            calls.extend((category, symbol, interval) for symbol, interval in pairs)
+            return set(pairs)
             
-        self.ws_client.subscribe_kline = AsyncMock(side_effect=mock_subscribe_kline)
+        self.ws_client.subscribe_klines_bulk = AsyncMock(side_effect=mock_subscribe_klines_bulk)
         
         await self.manager._start_websocket_subscriptions()
         
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import unittest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.api.common import Kline
-from src.api.global_market_data_manager import GlobalMarketDataManager, SubscriptionRequest
+from src.api.global_market_data_manager import GlobalMarketDataManager, SubBucket, SubscriptionRequest
 
 
 class TestGlobalMarketDataManager(unittest.IsolatedAsyncioTestCase):
@@ -34,6 +34,23 @@ class TestGlobalMarketDataManager(unittest.IsolatedAsyncioTestCase):
         self.strategy_cfg = StrategyCfg()
         self.strategy_callback = AsyncMock()
 
+    async def _run_polling_cycle(self, subs_by_symbol: dict[str, SubBucket], tickers: dict) -> None:
+        # Один цикл _polling_loop с заданными тикерами
+        async def get_tickers(category: str, symbols: list[str]) -> dict:
+            self.manager.polling_active = False
+            return tickers
+        async def fake_sleep(delay: float) -> None:
+            pass
+        self.manager._get_tickers = get_tickers
+        self.manager.polling_active = True
+        with patch("src.api.global_market_data_manager.asyncio.sleep", fake_sleep):
+            await self.manager._polling_loop("5s", "linear", subs_by_symbol, 5)
+
+    async def _drain_callbacks(self) -> None:
+        # _ws_callback только запускает callbacks стратегий
+        while self.manager._callback_tasks:
+            await asyncio.gather(*self.manager._callback_tasks.values())
+
     async def test_register_strategy_creates_subscriptions(self) -> None:
         self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
         keys = set(self.manager.subscriptions.keys())
@@ -47,34 +64,354 @@ class TestGlobalMarketDataManager(unittest.IsolatedAsyncioTestCase):
                 else:
                     self.assertEqual(s.source_type, "websocket")
 
+    async def test_register_resolves_category_once_per_symbol(self) -> None:
+        calls: list[str] = []
+        get_pair_category = self.strategy_cfg.get_pair_category
+        self.strategy_cfg.get_pair_category = lambda symbol: calls.append(symbol) or get_pair_category(symbol)
+        self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
+        self.assertEqual(sorted(calls), ["BTCUSDT", "ETHUSDT", "PEPEUSDT", "WIFUSDT"])
+
+    async def test_category_falls_back_to_market_category(self) -> None:
+        class SpotCfg:
+            def get_market_category(self) -> str:
+                return "spot"
+        resolve = GlobalMarketDataManager._category_resolver(SpotCfg())
+        self.assertEqual(resolve("BTCUSDT"), "spot")
+
     async def test_start_initializes_ws_and_polling(self) -> None:
         self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
-        async def fake_subscribe_kline(category: str, symbol: str, interval: str, callback: object) -> bool:
-            return True
-        self.ws_client.subscribe_kline = AsyncMock(side_effect=fake_subscribe_kline)
+        async def fake_subscribe_klines_bulk(category: str, pairs: list, callback: object) -> set:
+            return set(pairs)
+        self.ws_client.subscribe_klines_bulk = AsyncMock(side_effect=fake_subscribe_klines_bulk)
         await self.manager.start()
-        self.ws_client.subscribe_kline.assert_any_await(
-            category="linear", symbol="BTCUSDT", interval="1", callback=self.manager._ws_callback
+        self.ws_client.subscribe_klines_bulk.assert_awaited_once_with(
+            category="linear",
+            pairs=[("BTCUSDT", "1"), ("PEPEUSDT", "1"), ("WIFUSDT", "1")],
+            callback=self.manager._ws_callback,
         )
+        self.assertIn(("BTCUSDT", "1", "linear"), self.manager.active_ws_subscriptions)
         self.assertGreaterEqual(len(self.manager.polling_tasks), 1)
         await self.manager.stop()
 
+    async def test_activation_subscribes_only_new_ws_keys(self) -> None:
+        self.ws_client.subscribe_klines_bulk = AsyncMock(side_effect=lambda category, pairs, callback: set(pairs))
+        self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
+        await self.manager._start_websocket_subscriptions()
+        self.assertEqual(len(self.manager.active_ws_subscriptions), 3)
+        self.manager._add_subscription("OTHER", "SOLUSDT", "1", "linear", self.strategy_callback, "websocket")
+        await self.manager._start_websocket_subscriptions()
+        self.assertEqual(self.ws_client.subscribe_klines_bulk.await_count, 2)
+        self.ws_client.subscribe_klines_bulk.assert_awaited_with(
+            category="linear", pairs=[("SOLUSDT", "1")], callback=self.manager._ws_callback
+        )
+
+    async def test_failed_bulk_topics_stay_inactive(self) -> None:
+        self.ws_client.subscribe_klines_bulk = AsyncMock(return_value={("BTCUSDT", "1")})
+        self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
+        await self.manager._start_websocket_subscriptions()
+        self.assertEqual(self.manager.active_ws_subscriptions, {("BTCUSDT", "1", "linear")})
+
+    async def test_late_registration_is_activated_by_worker(self) -> None:
+        self.manager._activate_new_subscriptions = AsyncMock()
+        self.manager._activation_worker = asyncio.create_task(self.manager._activation_worker_loop())
+        self.manager.is_running = True
+        self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
+        # stop() дожидается активаций, уже поставленных в очередь
+        await self.manager.stop()
+        self.manager._activate_new_subscriptions.assert_awaited_once_with("TEST-STRAT")
+        self.assertIsNone(self.manager._activation_worker)
+
+    async def test_burst_registrations_activate_in_one_pass(self) -> None:
+        self.manager._activate_new_subscriptions = AsyncMock()
+        self.manager.is_running = True
+        for name in ("A", "B", "C"):
+            self.manager._activation_queue.put_nowait(name)
+        self.manager._activation_worker = asyncio.create_task(self.manager._activation_worker_loop())
+        await self.manager.stop()
+        self.manager._activate_new_subscriptions.assert_awaited_once_with("A, B, C")
+
     async def test_ws_callback_distributes_to_registered_callbacks(self) -> None:
         self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
         self.manager.active_ws_subscriptions.add(("BTCUSDT", "1", "linear"))
         kline = Kline(timestamp=0, open=1, high=1, low=1, close=1, volume=0, confirm=True)
         await self.manager._ws_callback("BTCUSDT", kline)
+        await self._drain_callbacks()
         self.strategy_callback.assert_awaited()
 
-    async def test_polling_distributes_data(self) -> None:
-        frame = "5s"
-        category = "linear"
-        subs = [
-            SubscriptionRequest("TEST-STRAT", "ETHUSDT", frame, category, self.strategy_callback, "polling")
-        ]
+    async def test_ws_callback_uses_symbol_index(self) -> None:
+        self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
+        self.assertEqual(
+            {s.symbol for s in self.manager.ws_subs_by_symbol["BTCUSDT"]}, {"BTCUSDT"}
+        )
+        self.assertNotIn("ETHUSDT", self.manager.ws_subs_by_symbol)  # 5s -> polling
         kline = Kline(timestamp=0, open=1, high=1, low=1, close=1, volume=0, confirm=True)
-        await self.manager._distribute_polling_data("ETHUSDT", frame, category, kline, subs)
-        self.strategy_callback.assert_awaited()
+        await self.manager._ws_callback("DOGEUSDT", kline)
+        self.strategy_callback.assert_not_awaited()
+        self.assertEqual(
+            set(self.manager.poll_subs[("5s", "linear")]), {"ETHUSDT", "WIFUSDT", "PEPEUSDT"}
+        )
+        self.manager.unregister_strategy("TEST-STRAT")
+        self.assertEqual(self.manager.ws_subs_by_symbol, {})
+        self.assertEqual(self.manager.poll_subs, {})
+
+    async def test_ws_callback_isolates_failing_strategy(self) -> None:
+        failing = AsyncMock(side_effect=RuntimeError("boom"))
+        self.manager._add_subscription("A", "BTCUSDT", "1", "linear", failing, "websocket")
+        self.manager._add_subscription("B", "BTCUSDT", "1", "linear", self.strategy_callback, "websocket")
+        kline = Kline(timestamp=0, open=1, high=1, low=1, close=1, volume=0, confirm=True)
+        await self.manager._ws_callback("BTCUSDT", kline)
+        await self._drain_callbacks()
+        failing.assert_awaited_once()
+        self.strategy_callback.assert_awaited_once_with("BTCUSDT", kline)
+
+    async def test_sub_bucket_keeps_callbacks_parallel_to_subs(self) -> None:
+        self.manager._add_subscription("A", "BTCUSDT", "1", "linear", self.strategy_callback, "websocket")
+        other = AsyncMock()
+        self.manager._add_subscription("B", "BTCUSDT", "5", "linear", other, "websocket")
+        bucket = self.manager.ws_subs_by_symbol["BTCUSDT"]
+        self.assertEqual(bucket.callbacks, [self.strategy_callback, other])
+        self.assertEqual([s.strategy_name for s in bucket], ["A", "B"])
+        self.manager.registered_strategies.update({"A", "B"})
+        self.manager.unregister_strategy("A")
+        bucket = self.manager.ws_subs_by_symbol["BTCUSDT"]
+        self.assertEqual(bucket.callbacks, [other])
+        self.assertEqual([s.strategy_name for s in bucket], ["B"])
+
+    async def test_slow_callback_does_not_block_dispatch(self) -> None:
+        release = asyncio.Event()
+        async def slow(symbol: str, kline: Kline) -> None:
+            await release.wait()
+        self.manager.callback_timeout = 0.01
+        self.manager._add_subscription("SLOW", "BTCUSDT", "1", "linear", slow, "websocket")
+        self.manager._add_subscription("FAST", "BTCUSDT", "1", "linear", self.strategy_callback, "websocket")
+        tickers = {"BTCUSDT": {"lastPrice": "1"}}
+        await asyncio.wait_for(self._run_polling_cycle(self.manager.ws_subs_by_symbol, tickers), timeout=1)
+        self.strategy_callback.assert_awaited_once()
+        self.assertEqual(self.strategy_callback.await_args.args[0], "BTCUSDT")
+        # Медленный callback не отменён, а дорабатывает в фоне
+        self.assertEqual(list(self.manager._callback_tasks), [slow])
+        release.set()
+        await asyncio.gather(*self.manager._callback_tasks.values())
+        await asyncio.sleep(0)
+        self.assertEqual(self.manager._callback_tasks, {})
+
+    async def test_busy_callback_is_not_started_twice(self) -> None:
+        release = asyncio.Event()
+        active = 0
+        seen: list[tuple[str, float]] = []
+        async def slow(symbol: str, kline: Kline) -> None:
+            nonlocal active
+            active += 1
+            self.assertEqual(active, 1)
+            seen.append((symbol, kline.close))
+            await release.wait()
+            active -= 1
+        self.manager.callback_timeout = 0.01
+        self.manager._add_subscription("SLOW", "BTCUSDT", "1", "linear", slow, "websocket")
+        self.manager._add_subscription("SLOW", "ETHUSDT", "1", "linear", slow, "websocket")
+        for close in (1, 2, 3):
+            for symbol in ("BTCUSDT", "ETHUSDT"):
+                kline = Kline(timestamp=0, open=1, high=1, low=1, close=close, volume=0, confirm=True)
+                await self.manager._ws_callback(symbol, kline)
+        await asyncio.sleep(0)
+        # Пока первый вызов не завершён, свечи ждут в очереди callback
+        self.assertEqual(seen, [("BTCUSDT", 1)])
+        release.set()
+        await self._drain_callbacks()
+        self.assertEqual(seen, [
+            ("BTCUSDT", 1), ("ETHUSDT", 1), ("BTCUSDT", 2), ("ETHUSDT", 2), ("BTCUSDT", 3), ("ETHUSDT", 3),
+        ])
+        self.assertEqual(self.manager.dropped_klines, 0)
+
+    async def test_busy_callback_backlog_drops_oldest_and_counts(self) -> None:
+        release = asyncio.Event()
+        seen: list[float] = []
+        async def slow(symbol: str, kline: Kline) -> None:
+            seen.append(kline.close)
+            await release.wait()
+        self.manager._add_subscription("SLOW", "BTCUSDT", "1", "linear", slow, "websocket")
+        with patch("src.api.global_market_data_manager.CALLBACK_BACKLOG_SIZE", 2):
+            for close in (1, 2, 3, 4):
+                kline = Kline(timestamp=0, open=1, high=1, low=1, close=close, volume=0, confirm=True)
+                await self.manager._ws_callback("BTCUSDT", kline)
+            release.set()
+            await self._drain_callbacks()
+        self.assertEqual(seen, [1, 3, 4])
+        self.assertEqual(self.manager.dropped_klines, 1)
+
+    async def test_ws_callback_does_not_wait_for_strategies(self) -> None:
+        release = asyncio.Event()
+        async def slow(symbol: str, kline: Kline) -> None:
+            await release.wait()
+        self.manager._add_subscription("SLOW", "BTCUSDT", "1", "linear", slow, "websocket")
+        kline = Kline(timestamp=0, open=1, high=1, low=1, close=1, volume=0, confirm=True)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await self.manager._ws_callback("BTCUSDT", kline)
+        self.assertLess(loop.time() - started, self.manager.callback_timeout)
+        self.assertEqual(list(self.manager._callback_tasks), [slow])
+        release.set()
+        await self._drain_callbacks()
+
+    async def test_stop_awaits_running_callbacks(self) -> None:
+        release = asyncio.Event()
+        finished = []
+        async def slow(symbol: str, kline: Kline) -> None:
+            await release.wait()
+            finished.append(symbol)
+        self.manager.callback_timeout = 0.01
+        self.manager._add_subscription("SLOW", "BTCUSDT", "1", "linear", slow, "websocket")
+        kline = Kline(timestamp=0, open=1, high=1, low=1, close=1, volume=0, confirm=True)
+        await self.manager._ws_callback("BTCUSDT", kline)
+        stopping = asyncio.create_task(self.manager.stop())
+        await asyncio.sleep(0.02)
+        self.assertFalse(stopping.done())
+        release.set()
+        await asyncio.wait_for(stopping, timeout=1)
+        self.assertEqual(finished, ["BTCUSDT"])
+
+    async def test_polling_errors_back_off_exponentially(self) -> None:
+        outcomes = [RuntimeError("a"), RuntimeError("b"), {}, RuntimeError("c")]
+        sleeps: list[float] = []
+        async def get_tickers(category: str, symbols: list[str]) -> dict:
+            outcome = outcomes.pop(0)
+            if not outcomes:
+                self.manager.polling_active = False
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+        self.manager._get_tickers = get_tickers
+        self.manager.polling_active = True
+        loop = asyncio.get_running_loop()
+        with patch.object(loop, "time", lambda: 100.0), \
+             patch("src.api.bybit_client.random.uniform", return_value=1.0), \
+             patch("src.api.global_market_data_manager.asyncio.sleep", fake_sleep):
+            await self.manager._polling_loop("5s", "linear", {}, 5)
+        # Пауза после ошибки растёт, успешный цикл сбрасывает серию
+        self.assertEqual(sleeps, [0.25, 5.0, 0.5, 10.0, 15.0, 0.25, 20.0])
+
+    async def test_rest_failure_reaches_polling_backoff(self) -> None:
+        from src.api.bybit_client import BybitClient
+        sleeps: list[float] = []
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+            if len(sleeps) == 4:
+                self.manager.polling_active = False
+        with patch("src.api.bybit_client.BybitHTTP") as mock_http:
+            mock_http.return_value.get_tickers = AsyncMock(side_effect=ConnectionError("network down"))
+            mock_http.return_value.close = AsyncMock()
+            self.manager.rest_client = BybitClient("key", "secret", testnet=True)
+            subs_by_symbol = {"BTCUSDT": SubBucket(), "ETHUSDT": SubBucket()}
+            self.manager.polling_active = True
+            loop = asyncio.get_running_loop()
+            try:
+                with patch.object(loop, "time", lambda: 100.0), \
+                     patch("src.api.bybit_client.random.uniform", return_value=1.0), \
+                     patch("src.api.global_market_data_manager.asyncio.sleep", fake_sleep):
+                    await self.manager._polling_loop("5s", "linear", subs_by_symbol, 5)
+            finally:
+                await self.manager.rest_client.close()
+        # Ошибка get_tickers_batch доходит до цикла: пауза растёт между опросами
+        self.assertEqual(sleeps, [0.25, 5.0, 0.5, 10.0])
+
+    async def test_polling_cycle_waits_one_timeout_for_all_symbols(self) -> None:
+        release = asyncio.Event()
+        async def slow(symbol: str, kline: Kline) -> None:
+            await release.wait()
+        symbols = ("BTCUSDT", "ETHUSDT", "WIFUSDT")
+        # Отдельная медленная стратегия на каждую пару
+        subs_by_symbol = {
+            sym: SubBucket([SubscriptionRequest(f"S-{sym}", sym, "5s", "linear", AsyncMock(side_effect=slow), "polling")])
+            for sym in symbols
+        }
+        async def get_tickers(category: str, requested: list[str]) -> dict:
+            self.manager.polling_active = False
+            return {sym: {"lastPrice": "1"} for sym in requested}
+        async def fake_sleep(delay: float) -> None:
+            pass
+        self.manager._get_tickers = get_tickers
+        self.manager.callback_timeout = 0.1
+        self.manager.polling_active = True
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with patch("src.api.global_market_data_manager.asyncio.sleep", fake_sleep):
+            await self.manager._polling_loop("5s", "linear", subs_by_symbol, 5)
+        self.assertLess(loop.time() - started, 0.25)
+        self.assertEqual(len(self.manager._callback_tasks), 3)
+        release.set()
+        await self._drain_callbacks()
+
+    async def test_subscription_key_is_built_once_from_interned_strings(self) -> None:
+        category = "".join(["lin", "ear"])
+        self.manager._add_subscription("A", "BTCUSDT", "1", category, self.strategy_callback, "websocket")
+        sub = self.manager.ws_subs_by_symbol["BTCUSDT"].subs[0]
+        self.assertEqual(sub.key, ("BTCUSDT", "1", "linear"))
+        self.assertIs(sub.market_category, "linear")
+        self.assertIn(sub.key, self.manager.subscriptions)
+
+    async def test_polling_loop_fetches_tickers_in_one_batch(self) -> None:
+        symbols = ("BTCUSDT", "ETHUSDT", "WIFUSDT")
+        self.rest_client.get_tickers_batch = AsyncMock(
+            return_value={sym: {"lastPrice": "1"} for sym in symbols}
+        )
+        subs_by_symbol = {
+            sym: SubBucket([SubscriptionRequest("TEST-STRAT", sym, "5s", "linear", self.strategy_callback, "polling")])
+            for sym in symbols
+        }
+        self.manager.polling_active = True
+        task = asyncio.create_task(self.manager._polling_loop("5s", "linear", subs_by_symbol, 5))
+        for _ in range(30):
+            await asyncio.sleep(0)
+        self.manager.polling_active = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        self.rest_client.get_tickers_batch.assert_awaited_once_with("linear", list(symbols))
+        self.assertEqual(self.strategy_callback.await_count, 3)
+
+    async def test_polling_prefers_ws_tickers_and_falls_back_to_rest(self) -> None:
+        self.rest_client.get_tickers_batch = AsyncMock(return_value={"ETHUSDT": {"lastPrice": "2"}})
+        self.manager._ws_ticker_callback("linear")("BTCUSDT", {"lastPrice": "1"})
+        tickers = await self.manager._get_tickers("linear", ["BTCUSDT", "ETHUSDT"])
+        self.assertEqual(tickers, {"BTCUSDT": {"lastPrice": "1"}, "ETHUSDT": {"lastPrice": "2"}})
+        self.rest_client.get_tickers_batch.assert_awaited_once_with("linear", ["ETHUSDT"])
+
+    async def test_kline_reused_for_same_ticker_object(self) -> None:
+        ticker = {"lastPrice": "2", "highPrice24h": "3", "lowPrice24h": "1", "volume24h": "10"}
+        first = self.manager._kline_from_ticker("linear", "BTCUSDT", ticker, 1000)
+        self.assertIs(self.manager._kline_from_ticker("linear", "BTCUSDT", ticker, 1000), first)
+        fresh = self.manager._kline_from_ticker("linear", "BTCUSDT", dict(ticker, lastPrice="2.5"), 1000)
+        self.assertIsNot(fresh, first)
+        self.assertEqual(fresh.close, 2.5)
+
+    async def test_reused_ticker_gets_current_cycle_timestamp(self) -> None:
+        # Тихий символ: тот же WS тикер в следующем цикле
+        ticker = {"lastPrice": "2"}
+        self.manager._kline_from_ticker("linear", "BTCUSDT", ticker, 1000)
+        later = self.manager._kline_from_ticker("linear", "BTCUSDT", ticker, 2000)
+        self.assertEqual(later.timestamp, 2000)
+
+    async def test_stats_counters_follow_register_and_unregister(self) -> None:
+        self.manager.register_strategy(self.strategy_cfg, self.strategy_callback)
+        stats = self.manager.get_stats()
+        # sig_1 (WS) и sig_2 (5s polling): index + 2 trade_pairs каждый
+        self.assertEqual(stats["websocket_subscriptions"], 3)
+        self.assertEqual(stats["polling_subscriptions"], 3)
+        self.assertEqual(stats["subs_by_category"], {"linear": 6})
+        self.manager.unregister_strategy("TEST-STRAT")
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["websocket_subscriptions"], 0)
+        self.assertEqual(stats["polling_subscriptions"], 0)
+        self.assertEqual(stats["subs_by_category"], {})
+
+    async def test_polling_distributes_data(self) -> None:
+        subs_by_symbol = {
+            "ETHUSDT": SubBucket([SubscriptionRequest("TEST-STRAT", "ETHUSDT", "5s", "linear", self.strategy_callback, "polling")])
+        }
+        await self._run_polling_cycle(subs_by_symbol, {"ETHUSDT": {"lastPrice": "2"}})
+        self.strategy_callback.assert_awaited_once()
+        self.assertEqual(self.strategy_callback.await_args.args[1].close, 2.0)
 
 
 if __name__ == "__main__":
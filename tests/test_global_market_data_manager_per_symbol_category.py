@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import unittest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.api.common import Kline
 from src.api.global_market_data_manager import GlobalMarketDataManager, SubscriptionRequest
@@ -51,11 +51,11 @@ class TestGlobalMarketDataManagerPerSymbolCategory(unittest.IsolatedAsyncioTestC
         self.manager.register_strategy(self.strategy_cfg, self.callback)
         calls = []
 
-        async def fake_subscribe_kline(category: str, symbol: str, interval: str, callback: object) -> bool:
-            calls.append((category, symbol, interval))
-            return True
+        async def fake_subscribe_klines_bulk(category: str, pairs: list, callback: object) -> set:
+            calls.extend((category, symbol, interval) for symbol, interval in pairs)
+            return set(pairs)
 
-        self.ws_client.subscribe_kline = AsyncMock(side_effect=fake_subscribe_kline)
+        self.ws_client.subscribe_klines_bulk = AsyncMock(side_effect=fake_subscribe_klines_bulk)
         await self.manager._start_websocket_subscriptions()
         self.assertIn(("linear", "BTCUSDT", "1"), calls)
         self.assertIn(("linear", "WIFUSDT", "1"), calls)
@@ -69,16 +69,25 @@ class TestGlobalMarketDataManagerPerSymbolCategory(unittest.IsolatedAsyncioTestC
                     groups.setdefault((s.frame, s.market_category), []).append(s)
         self.assertIn(("5s", "spot"), groups)
 
-    async def test_distribute_polling_respects_category(self) -> None:
-        frame = "5s"
-        category = "spot"
-        subs = [
-            SubscriptionRequest("MIXED-STRAT", "ETHUSDT", frame, category, self.callback, "polling"),
-            SubscriptionRequest("MIXED-STRAT", "PEPEUSDT", frame, category, self.callback, "polling"),
-        ]
-        kline = Kline(timestamp=0, open=1, high=1, low=1, close=1, volume=0, confirm=True)
-        await self.manager._distribute_polling_data("ETHUSDT", frame, category, kline, subs)
-        self.callback.assert_awaited()
+    async def test_polling_loop_respects_category(self) -> None:
+        self.manager.register_strategy(self.strategy_cfg, self.callback)
+        requested: list[tuple[str, list[str]]] = []
+
+        async def get_tickers(category: str, symbols: list[str]) -> dict:
+            requested.append((category, symbols))
+            self.manager.polling_active = False
+            return {"ETHUSDT": {"lastPrice": "2"}}
+
+        async def fake_sleep(delay: float) -> None:
+            pass
+
+        self.manager._get_tickers = get_tickers
+        self.manager.polling_active = True
+        with patch("src.api.global_market_data_manager.asyncio.sleep", fake_sleep):
+            await self.manager._polling_loop("5s", "spot", self.manager.poll_subs[("5s", "spot")], 5)
+        self.assertEqual([(c, sorted(s)) for c, s in requested], [("spot", ["ETHUSDT", "PEPEUSDT"])])
+        self.callback.assert_awaited_once()
+        self.assertEqual(self.callback.await_args.args[0], "ETHUSDT")
 
 
 if __name__ == "__main__":
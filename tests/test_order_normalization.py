@@ -20,16 +20,21 @@ class TestNormalization(unittest.TestCase):
         self.assertEqual(BybitClient._floor_to_step(240.9639, 1.0), 240.0)
         self.assertEqual(BybitClient._ceil_to_step(240.001, 1.0), 241.0)
 
+    def test_step_rounding_without_fp_jitter(self):
+        # 0.3 / 0.1 во float = 2.9999999999999996 — floor не должен терять шаг
+        self.assertEqual(BybitClient._floor_to_step(0.3, 0.1), 0.3)
+        self.assertEqual(BybitClient._floor_to_step(0.7, 0.1), 0.7)
+        self.assertEqual(BybitClient._ceil_to_step(0.3, 0.1), 0.3)
+
     async def _normalize_case(self, *, qty_step, min_qty, tick, min_notional, last_price, pos_usdt, side):
         # Подменим кеш инструмента вручную, чтобы не ходить в сеть
         key = f"linear:TEST"
-        self.client._instrument_cache[key] = {
+        self.client._instrument_cache[key] = (1e18, {  # не истекает
             "qtyStep": qty_step,
             "minOrderQty": min_qty,
             "tickSize": tick,
             "minNotional": min_notional,
-        }
-        self.client._instrument_cache_ts[key] = 1e18  # не истекает
+        })
 
         return await self.client.normalize_order(
             category="linear",
@@ -27,6 +27,7 @@ class WorkabilityTest:
         })
         
         self.ws_client.subscribe_kline = AsyncMock(return_value=True)
+        self.ws_client.subscribe_klines_bulk = AsyncMock(side_effect=lambda category, pairs, callback: set(pairs))
         
     async def create_test_strategy(self):
         """Создаём тестовую стратегию с разными frame"""
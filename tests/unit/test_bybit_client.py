@@ -1,61 +1,67 @@
+import asyncio
+
 import pytest
 
 from unittest.mock import Mock, AsyncMock, patch
-from src.api.bybit_client import BybitClient, async_wrap
+from src.api.bybit_client import BybitClient, get_client
 
 
 @pytest.mark.unit
-class TestAsyncWrap:
-    """Тесты async_wrap декоратора"""
+class TestBybitClientSingleton:
+    """Тесты Singleton pattern"""
 
     @pytest.mark.asyncio
-    async def test_async_wrap_with_functools_partial(self):
-        """Проверяем functools.partial вместо lambda"""
-        from concurrent.futures import ThreadPoolExecutor
+    async def test_singleton_initialization(self):
+        """get_client с тем же api_key возвращает тот же instance"""
+        client1 = await get_client("key1", "secret1", testnet=True)
+        client2 = await get_client("key1", "secret1", testnet=False)
 
-        class TestClass:
-            def __init__(self):
-                self._executor = ThreadPoolExecutor(max_workers=1)
+        assert client1 is client2
+        # Параметры первой инициализации сохраняются
+        assert client2.api_key == "key1"
+        assert client2.testnet is True
 
-            @async_wrap
-            def sync_method(self, x, y, z = 10):
-                return x + y + z
+    @pytest.mark.asyncio
+    async def test_singleton_concurrent_get_client(self):
+        """Параллельные get_client создают ровно один клиент"""
+        import asyncio
 
-        obj = TestClass()
+        clients = await asyncio.gather(*[get_client("key1", "secret1") for _ in range(10)])
 
-        try:
-            result = await obj.sync_method(5, 3, z=2)
-            assert result == 10
-        finally:
-            obj._executor.shutdown(wait=True)
+        assert all(c is clients[0] for c in clients)
 
+    @pytest.mark.asyncio
+    async def test_singleton_rejects_different_api_key(self):
+        """get_client с другим api_key — ошибка, а не молча чужой клиент"""
+        await get_client("key1", "secret1", testnet=True)
 
-@pytest.mark.unit
-class TestBybitClientSingleton:
-    """Тесты Singleton pattern"""
+        with pytest.raises(ValueError):
+            await get_client("key2", "secret2", testnet=False)
 
-    def test_singleton_initialization(self):
-        """Проверяем _initialized флаг"""
-        # Сбрасываем singleton перед тестом
-        BybitClient._instance = None
-        BybitClient._initialized = False
+    def test_singleton_metaclass_is_thread_safe(self):
+        """Параллельное создание из потоков выполняет __init__ ровно один раз"""
+        import threading
+        import time
+        from src.api.common import Singleton
 
-        client1 = BybitClient("key1", "secret1", testnet=True)
-        assert BybitClient._initialized is True
+        init_calls = []
 
-        # Второй раз должен вернуть тот же instance
-        client2 = BybitClient("key2", "secret2", testnet=False)
+        class Slow(metaclass=Singleton):
+            def __init__(self, api_key: str):
+                init_calls.append(api_key)
+                time.sleep(0.01)
+                self.api_key = api_key
 
-        assert client1 is client2
-        # Проверяем что ключи НЕ изменились (из-за _initialized)
-        assert client2.api_key == "key1"
-        assert client2.api_secret == "secret1"
+        threads = [threading.Thread(target=Slow, args=("key1",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert init_calls == ["key1"]
 
     def test_singleton_reset(self):
         """Тест сброса singleton для изоляции тестов"""
-        BybitClient._instance = None
-        BybitClient._initialized = False
-
         client = BybitClient("new_key", "new_secret", testnet=True)
         assert client.api_key == "new_key"
 
@@ -64,11 +70,6 @@ class TestBybitClientSingleton:
 class TestBybitClient:
     """Тесты Bybit клиента"""
 
-    def setup_method(self):
-        """Setup для каждого теста"""
-        BybitClient._instance = None
-        BybitClient._initialized = False
-
     def test_client_initialization(self):
         """Тест инициализации"""
         client = BybitClient("test_key", "test_secret", testnet=True)
@@ -80,10 +81,10 @@ class TestBybitClient:
         assert client.error_count == 0
 
     @pytest.mark.asyncio
-    @patch('src.api.bybit_client.HTTP')
+    @patch('src.api.bybit_client.BybitHTTP')
     async def test_get_ticker_price_success(self, mock_http):
         """Тест получения цены тикера"""
-        mock_session = Mock()
+        mock_session = AsyncMock()
         mock_session.get_tickers.return_value = {
             "retCode": 0,
             "result": {
@@ -106,10 +107,10 @@ class TestBybitClient:
             await client.close()
 
     @pytest.mark.asyncio
-    @patch('src.api.bybit_client.HTTP')
+    @patch('src.api.bybit_client.BybitHTTP')
     async def test_get_ticker_price_error(self, mock_http):
         """Тест ошибки получения цены"""
-        mock_session = Mock()
+        mock_session = AsyncMock()
         mock_session.get_tickers.return_value = {
             "retCode": 10001,
             "retMsg": "API error"
@@ -126,10 +127,10 @@ class TestBybitClient:
             await client.close()
 
     @pytest.mark.asyncio
-    @patch('src.api.bybit_client.HTTP')
+    @patch('src.api.bybit_client.BybitHTTP')
     async def test_set_leverage_success(self, mock_http):
         """Тест установки плеча"""
-        mock_session = Mock()
+        mock_session = AsyncMock()
         mock_session.set_leverage.return_value = {"retCode": 0}
         mock_http.return_value = mock_session
 
@@ -149,10 +150,10 @@ class TestBybitClient:
             await client.close()
 
     @pytest.mark.asyncio
-    @patch('src.api.bybit_client.HTTP')
+    @patch('src.api.bybit_client.BybitHTTP')
     async def test_place_market_order_success(self, mock_http):
         """Тест размещения ордера"""
-        mock_session = Mock()
+        mock_session = AsyncMock()
         mock_session.place_order.return_value = {
             "retCode": 0,
             "result": {
@@ -186,10 +187,10 @@ class TestBybitClient:
             await client.close()
 
     @pytest.mark.asyncio
-    @patch('src.api.bybit_client.HTTP')
+    @patch('src.api.bybit_client.BybitHTTP')
     async def test_get_wallet_balance(self, mock_http):
         """Тест получения баланса"""
-        mock_session = Mock()
+        mock_session = AsyncMock()
         mock_session.get_wallet_balance.return_value = {
             "retCode": 0,
             "result": {
@@ -225,10 +226,10 @@ class TestBybitClient:
         assert "5.00%" in stats["error_rate"]
 
     @pytest.mark.asyncio
-    @patch('src.api.bybit_client.HTTP')
+    @patch('src.api.bybit_client.BybitHTTP')
     async def test_get_klines_returns_kline_objects(self, mock_http):
         """Проверяем что get_klines возвращает Kline objects"""
-        mock_session = Mock()
+        mock_session = AsyncMock()
         mock_session.get_kline.return_value = {
             "retCode": 0,
             "result": {
@@ -256,6 +257,353 @@ class TestBybitClient:
         finally:
             await client.close()
 
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_get_klines_columnar_chronological(self, mock_http):
+        """get_klines отдаёт KlineBatch: колонки NumPy от старых к новым"""
+        mock_session = AsyncMock()
+        mock_session.get_kline.return_value = {
+            "retCode": 0,
+            "result": {
+                "list": [
+                    ["1729900800000", "50000", "50100", "49900", "50050", "1234.5", "12345"],
+                    ["1729900500000", "50050", "50150", "49950", "50100", "987.3", "9873"]
+                ]
+            }
+        }
+        mock_http.return_value = mock_session
+
+        client = BybitClient("test_key", "test_secret")
+
+        try:
+            from src.api.common import KlineBatch
+            klines = await client.get_klines("spot", "BTCUSDT", "5", limit=2)
+
+            assert isinstance(klines, KlineBatch)
+            assert klines.ts.tolist() == [1729900500000, 1729900800000]
+            assert klines.close.tolist() == [50100.0, 50050.0]
+            assert [k.close for k in klines[:-1]] == [50100.0]
+            assert len(klines.as_klines()) == 2
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_get_tickers_batch_single_request_and_cache(self, mock_http):
+        """Несколько пар — один запрос на категорию, повтор в пределах TTL из кэша"""
+        mock_session = AsyncMock()
+        mock_session.get_tickers.return_value = {
+            "retCode": 0,
+            "result": {
+                "list": [
+                    {"symbol": "BTCUSDT", "lastPrice": "50000"},
+                    {"symbol": "ETHUSDT", "lastPrice": "3000"},
+                    {"symbol": "SOLUSDT", "lastPrice": "150"},
+                ]
+            }
+        }
+        mock_http.return_value = mock_session
+
+        client = BybitClient("test_key", "test_secret")
+
+        try:
+            tickers = await client.get_tickers_batch("linear", ["BTCUSDT", "ETHUSDT", "XRPUSDT"])
+            assert set(tickers) == {"BTCUSDT", "ETHUSDT"}
+            mock_session.get_tickers.assert_awaited_once_with(category="linear")
+
+            tickers = await client.get_tickers_batch("linear", ["SOLUSDT"])
+            assert tickers["SOLUSDT"]["lastPrice"] == "150"
+            assert mock_session.get_tickers.await_count == 1
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_get_instruments_info_single_flight(self, mock_http):
+        """Параллельные запросы одного символа делают один REST вызов и кэшируются"""
+        import asyncio
+
+        async def slow_instruments(**kwargs):
+            await asyncio.sleep(0)
+            return {
+                "retCode": 0,
+                "result": {"list": [{
+                    "lotSizeFilter": {"qtyStep": "0.01", "minOrderQty": "0.01"},
+                    "priceFilter": {"tickSize": "0.1"},
+                }]}
+            }
+
+        mock_session = AsyncMock()
+        mock_session.get_instruments_info.side_effect = slow_instruments
+        mock_http.return_value = mock_session
+
+        client = BybitClient("test_key", "test_secret")
+
+        try:
+            specs = await asyncio.gather(*[
+                client.get_instruments_info("linear", "BTCUSDT") for _ in range(5)
+            ])
+            assert all(spec == specs[0] for spec in specs)
+            assert specs[0]["qtyStep"] == 0.01
+
+            await client.get_instruments_info("linear", "BTCUSDT")
+            assert mock_session.get_instruments_info.await_count == 1
+            assert not client._inflight
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_wallet_balance_cached_and_invalidated_by_order(self, mock_http):
+        """Баланс кэшируется на короткий TTL и сбрасывается после ордера"""
+        mock_session = AsyncMock()
+        mock_session.get_wallet_balance.return_value = {
+            "retCode": 0,
+            "result": {"list": [{"totalEquity": "100"}]}
+        }
+        mock_session.place_order.return_value = {"retCode": 0, "result": {"orderId": "1"}}
+        mock_http.return_value = mock_session
+
+        client = BybitClient("test_key", "test_secret")
+
+        try:
+            await client.get_wallet_balance()
+            await client.get_wallet_balance()
+            assert mock_session.get_wallet_balance.await_count == 1
+
+            await client.place_market_order("linear", "BTCUSDT", "Buy", "0.01", "51000", "49000")
+
+            await client.get_wallet_balance()
+            assert mock_session.get_wallet_balance.await_count == 2
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_stale_inflight_does_not_evict_new_fetch(self, mock_http):
+        """Запрос, сброшенный инвалидацией, по завершении не снимает новый запрос того же ключа"""
+        import asyncio
+
+        release_old, release_new = asyncio.Event(), asyncio.Event()
+        releases = iter([release_old, release_new])
+
+        async def slow_balance(**kwargs):
+            await next(releases).wait()
+            return {"retCode": 0, "result": {"list": [{"totalEquity": "100"}]}}
+
+        mock_session = AsyncMock()
+        mock_session.get_wallet_balance.side_effect = slow_balance
+        mock_http.return_value = mock_session
+
+        client = BybitClient("test_key", "test_secret")
+        key = (id(client._balance_cache), "UNIFIED")
+
+        try:
+            old = asyncio.create_task(client.get_wallet_balance())
+            await asyncio.sleep(0)
+            client._invalidate_account_cache()
+            new = asyncio.create_task(client.get_wallet_balance())
+            await asyncio.sleep(0)
+            new_inflight = client._inflight[key]
+
+            release_old.set()
+            await old
+            assert client._inflight.get(key) is new_inflight
+
+            release_new.set()
+            await new
+            assert key not in client._inflight
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_gather_klines_bounds_concurrency_and_keeps_order(self, monkeypatch):
+        """gather_klines: порядок результатов как у targets, не больше KLINES_CONCURRENCY одновременно"""
+        import asyncio
+        from src.api import bybit_client
+
+        monkeypatch.setattr(bybit_client, "KLINES_CONCURRENCY", 2)
+        client = BybitClient("test_key", "test_secret")
+
+        active = 0
+        peak = 0
+
+        async def fake_get_klines(self, category, symbol, interval, limit):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0)
+            active -= 1
+            return [symbol]
+
+        monkeypatch.setattr(BybitClient, "get_klines", fake_get_klines)
+
+        targets = [("linear", f"SYM{i}USDT") for i in range(6)]
+        result = await client.gather_klines(targets, "1", limit=2)
+
+        assert result == [[s] for _, s in targets]
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_positions_batch_and_ticker_prices(self, mock_http):
+        """Позиции запрашиваются параллельно по символам, цены — одним запросом тикеров"""
+        mock_session = AsyncMock()
+
+        async def positions(category, symbol):
+            size = "1" if symbol == "BTCUSDT" else "0"
+            return {"retCode": 0, "result": {"list": [{"symbol": symbol, "size": size}]}}
+
+        mock_session.get_positions.side_effect = positions
+        mock_session.get_tickers.return_value = {
+            "retCode": 0,
+            "result": {"list": [
+                {"symbol": "BTCUSDT", "lastPrice": "50000.5"},
+                {"symbol": "ETHUSDT", "lastPrice": "3000"},
+            ]},
+        }
+        mock_http.return_value = mock_session
+
+        client = BybitClient("key", "secret", testnet=True)
+
+        result = await client.get_positions_batch("linear", ["BTCUSDT", "ETHUSDT"])
+        assert result["BTCUSDT"]["size"] == "1"
+        assert result["ETHUSDT"] is None
+
+        prices = await client.get_ticker_prices("linear", ["BTCUSDT", "ETHUSDT"])
+        assert prices == {"BTCUSDT": 50000.5, "ETHUSDT": 3000.0}
+        mock_session.get_tickers.assert_awaited_once_with(category="linear")
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_get_tickers_batch_raises_on_failed_request(self, mock_http):
+        """Ошибка запроса отличается от пустого ответа: batch поднимает её, get_ticker отдаёт None"""
+        from src.api.bybit_client import BybitAPIError
+
+        mock_session = AsyncMock()
+        mock_session.get_tickers.return_value = {"retCode": 10006, "retMsg": "Too many visits"}
+        mock_http.return_value = mock_session
+
+        client = BybitClient("test_key", "test_secret")
+
+        try:
+            with pytest.raises(BybitAPIError):
+                await client.get_tickers_batch("linear", ["BTCUSDT", "ETHUSDT"])
+            with pytest.raises(BybitAPIError):
+                await client.get_tickers_batch("linear", ["BTCUSDT"])
+            assert await client.get_ticker("linear", "BTCUSDT") is None
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_option_tickers_fetched_per_symbol(self, mock_http):
+        """Для option список категории недоступен — тикеры запрашиваются по символам"""
+        mock_session = AsyncMock()
+
+        async def tickers(category, symbol=None):
+            return {"retCode": 0, "result": {"list": [{"symbol": symbol, "lastPrice": "10"}]}}
+
+        mock_session.get_tickers.side_effect = tickers
+        mock_http.return_value = mock_session
+
+        client = BybitClient("key", "secret", testnet=True)
+        symbols = ["BTC-27DEC24-60000-C", "BTC-27DEC24-60000-P"]
+
+        result = await client.get_tickers_batch("option", symbols)
+
+        assert set(result) == set(symbols)
+        assert all(c.kwargs["symbol"] in symbols for c in mock_session.get_tickers.await_args_list)
+        assert mock_session.get_tickers.await_count == 2
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_concurrent_ticker_polls_share_one_request(self, mock_http):
+        """Одновременные промахи по тикерам ждут один запрос, а не шлют свои"""
+        mock_session = AsyncMock()
+
+        async def tickers(category, symbol=None):
+            await asyncio.sleep(0)
+            items = [{"symbol": symbol or s, "lastPrice": "1"} for s in ("BTCUSDT", "ETHUSDT")]
+            return {"retCode": 0, "result": {"list": items[:1] if symbol else items}}
+
+        mock_session.get_tickers.side_effect = tickers
+        mock_http.return_value = mock_session
+
+        client = BybitClient("key", "secret", testnet=True)
+
+        batches = await asyncio.gather(
+            client.get_tickers_batch("linear", ["BTCUSDT", "ETHUSDT"]),
+            client.get_tickers_batch("linear", ["ETHUSDT", "BTCUSDT"]),
+        )
+        singles = await asyncio.gather(
+            client.get_ticker("spot", "BTCUSDT"),
+            client.get_ticker("spot", "BTCUSDT"),
+        )
+
+        assert batches[0] == batches[1]
+        assert singles[0] is singles[1]
+        assert mock_session.get_tickers.await_count == 2
+
+    def test_build_order_params_is_pure_and_validates_qty(self):
+        """Параметры ордера собираются без сети, невалидный qty -> ValueError"""
+        params = BybitClient._build_order_params("linear", "BTCUSDT", "Buy", "0.01", "51000", "49000")
+
+        assert params == {
+            "category": "linear",
+            "symbol": "BTCUSDT",
+            "side": "Buy",
+            "orderType": "Market",
+            "qty": "0.01",
+            "positionIdx": 0,
+            "takeProfit": "51000",
+            "stopLoss": "49000",
+        }
+
+        for bad_qty in ("", "0", "-1", "abc"):
+            with pytest.raises(ValueError):
+                BybitClient._build_order_params("linear", "BTCUSDT", "Buy", bad_qty)
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.asyncio.sleep', new_callable=AsyncMock)
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_retry_backs_off_and_stops_on_non_retryable(self, mock_http, mock_sleep):
+        """Повторяемый retCode повторяется с растущей паузой, неповторяемый — сразу ошибка"""
+        mock_session = AsyncMock()
+        mock_session.get_wallet_balance.side_effect = [
+            {"retCode": 10006, "retMsg": "Too many visits"},
+            {"retCode": 10006, "retMsg": "Too many visits"},
+            {"retCode": 0, "result": {"list": []}},
+        ]
+        mock_session.set_leverage.return_value = {"retCode": 10001, "retMsg": "params error"}
+        mock_http.return_value = mock_session
+
+        client = BybitClient("key", "secret", testnet=True)
+
+        assert await client.get_wallet_balance() == {"list": []}
+        assert mock_session.get_wallet_balance.await_count == 3
+        first, second = (c.args[0] for c in mock_sleep.await_args_list)
+        assert 0.25 <= first <= 0.75 and 0.5 <= second <= 1.5
+
+        mock_sleep.reset_mock()
+        assert await client.set_leverage("linear", "BTCUSDT", 5) is False
+        mock_session.set_leverage.assert_awaited_once()
+        mock_sleep.assert_not_awaited()
+
+    def test_shared_executor_sized_from_env(self, monkeypatch):
+        """Общий пул создаётся один раз, размер берётся из BYBIT_THREAD_POOL_SIZE"""
+        from src.api import bybit_client
+
+        monkeypatch.setattr(bybit_client, "_executor", None)
+        monkeypatch.setenv("BYBIT_THREAD_POOL_SIZE", "3")
+
+        executor = bybit_client._get_executor()
+        try:
+            assert executor is bybit_client._get_executor()
+            assert executor._max_workers == 3
+        finally:
+            executor.shutdown(wait=False)
+
 
 @pytest.mark.unit
 class TestBybitWebSocketClient:
@@ -281,3 +629,238 @@ class TestBybitWebSocketClient:
 
             # Проверяем что kline_stream вызван
             mock_instance.kline_stream.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_subscribe_kline_multiplexes_per_category(self):
+        """Одно соединение на category, повторный топик не переподписывается"""
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+
+        with patch('src.api.bybit_websocket_client.WebSocket') as mock_ws:
+            mock_ws.side_effect = lambda **kwargs: Mock()
+
+            try:
+                for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT"):
+                    assert await ws_client.subscribe_kline("linear", symbol, "1", Mock())
+                assert await ws_client.subscribe_kline("linear", "BTCUSDT", "1", Mock())
+                assert await ws_client.subscribe_kline("spot", "BTCUSDT", "1", Mock())
+
+                assert mock_ws.call_count == 2
+                assert set(ws_client.ws_connections) == {"linear", "spot"}
+                assert ws_client.ws_connections["linear"].kline_stream.call_count == 3
+                assert set(ws_client.last_message_times) == {"linear", "spot"}
+                assert len(ws_client._cb_table[("linear", "kline.1.BTCUSDT")][0]) == 2
+            finally:
+                await ws_client.close()
+
+    @pytest.mark.asyncio
+    async def test_subscribe_klines_bulk_sends_chunked_frames(self):
+        """Новые топики одного interval уходят общими фреймами, известные только получают callback"""
+        from src.api.bybit_websocket_client import BybitWebSocketClient, TOPICS_PER_SUBSCRIBE
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+
+        with patch('src.api.bybit_websocket_client.WebSocket') as mock_ws:
+            mock_ws.side_effect = lambda **kwargs: Mock()
+
+            try:
+                assert await ws_client.subscribe_kline("linear", "BTCUSDT", "1", Mock())
+                symbols = [f"S{i}USDT" for i in range(TOPICS_PER_SUBSCRIBE + 2)]
+                pairs = [(sym, "1") for sym in symbols] + [("BTCUSDT", "1"), ("ETHUSDT", "5")]
+
+                subscribed = await ws_client.subscribe_klines_bulk("linear", pairs, Mock())
+
+                assert subscribed == set(pairs)
+                ws = ws_client.ws_connections["linear"]
+                sent = [c.kwargs for c in ws.kline_stream.call_args_list[1:]]
+                assert sent[0]["symbol"] == symbols[:TOPICS_PER_SUBSCRIBE]
+                assert sent[1]["symbol"] == symbols[TOPICS_PER_SUBSCRIBE:]
+                assert (sent[2]["interval"], sent[2]["symbol"]) == ("5", ["ETHUSDT"])
+                assert len(sent) == 3
+                assert len(ws_client._cb_table[("linear", "kline.1.BTCUSDT")][0]) == 2
+            finally:
+                await ws_client.close()
+
+    @pytest.mark.asyncio
+    async def test_dispatch_routes_by_category_and_topic(self):
+        """Сообщение общего соединения уходит только в callbacks своего топика"""
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+
+        btc_linear, btc_spot = Mock(), Mock()
+        ws_client._cb_table[("linear", "kline.1.BTCUSDT")] = ((btc_linear,), ())
+        ws_client._cb_table[("spot", "kline.1.BTCUSDT")] = ((btc_spot,), ())
+
+        ws_client._dispatch("linear", {
+            "topic": "kline.1.BTCUSDT",
+            "data": [{"start": 1, "open": "1", "high": "2", "low": "0.5", "close": "1.5",
+                      "volume": "10", "confirm": True}],
+        })
+
+        try:
+            # callbacks вызывает потребитель очереди в event loop
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+            btc_linear.assert_called_once()
+            symbol, kline = btc_linear.call_args.args
+            assert symbol == "BTCUSDT"
+            assert kline.close == 1.5 and kline.confirm is True
+            btc_spot.assert_not_called()
+        finally:
+            await ws_client.close()
+
+    @pytest.mark.asyncio
+    async def test_kline_queue_drops_oldest_when_full(self, monkeypatch):
+        """При переполнении очереди вытесняется самое старое сообщение"""
+        from src.api import bybit_websocket_client
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        monkeypatch.setattr(bybit_websocket_client, "KLINE_QUEUE_SIZE", 2)
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+        # Останавливаем потребителя, чтобы очередь наполнилась
+        ws_client._consumer_task.cancel()
+
+        for i in range(3):
+            ws_client._enqueue((((), ()), "BTCUSDT", i))
+
+        assert ws_client.dropped_messages == 1
+        assert [ws_client._kline_queue.get_nowait()[2] for _ in range(2)] == [1, 2]
+        await ws_client.close()
+
+    @pytest.mark.asyncio
+    async def test_kline_burst_drained_with_single_wakeup(self):
+        """Пачка klines из потока pybit будит event loop один раз"""
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+        loop = asyncio.get_running_loop()
+        callback = Mock()
+
+        try:
+            with patch.object(loop, "call_soon_threadsafe", wraps=loop.call_soon_threadsafe) as wakeup:
+                for i in range(5):
+                    ws_client._post((((callback,), ()), "BTCUSDT", i))
+                for _ in range(3):
+                    await asyncio.sleep(0)
+
+            assert wakeup.call_count == 1
+            assert [c.args[1] for c in callback.call_args_list] == [0, 1, 2, 3, 4]
+        finally:
+            await ws_client.close()
+
+    @pytest.mark.asyncio
+    async def test_slow_async_callback_does_not_block_consumer(self):
+        """Медленный async подписчик не задерживает остальных; его вызовы идут по очереди"""
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+        release = asyncio.Event()
+        active = 0
+        slow_seen: list[int] = []
+
+        async def slow(symbol, kline):
+            nonlocal active
+            active += 1
+            assert active == 1
+            slow_seen.append(kline)
+            await release.wait()
+            active -= 1
+
+        fast = AsyncMock()
+
+        try:
+            for i in range(3):
+                ws_client._enqueue((((), (slow,)), "BTCUSDT", i))
+                ws_client._enqueue((((), (fast,)), "ETHUSDT", i))
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            assert [c.args[1] for c in fast.await_args_list] == [0, 1, 2]
+            assert slow_seen == [0]
+
+            release.set()
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert slow_seen == [0, 1, 2]
+            assert ws_client._callback_tasks == {}
+        finally:
+            await ws_client.close()
+
+    def test_ws_on_message_parses_with_orjson(self):
+        """Фрейм разбирается orjson и уходит в callback pybit, pong отбрасывается"""
+        from src.api.bybit_websocket_client import WebSocket
+
+        ws = WebSocket.__new__(WebSocket)
+        ws.callback = Mock()
+        ws._is_custom_pong = lambda message: message.get("op") == "pong"
+
+        ws._on_message(b'{"topic": "kline.1.BTCUSDT", "data": []}')
+        ws._on_message('{"op": "pong"}')
+
+        ws.callback.assert_called_once_with({"topic": "kline.1.BTCUSDT", "data": []})
+
+    @pytest.mark.asyncio
+    async def test_single_watchdog_reconnects_stale_category(self, monkeypatch):
+        """Один sweep-watchdog переподключает только молчащую category, не больше max_reconnect_attempts"""
+        from src.api import bybit_websocket_client
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        monkeypatch.setattr(bybit_websocket_client, "WATCHDOG_INTERVAL", 0)
+        reconnect = Mock()
+        monkeypatch.setattr(BybitWebSocketClient, "_reconnect", reconnect)
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        ws_client.max_reconnect_attempts = 2
+        await ws_client.connect()
+
+        import time
+        ws_client.last_message_times["linear"] = time.monotonic() - 100
+        ws_client.last_message_times["spot"] = time.monotonic()
+
+        try:
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+            assert [c.args[0] for c in reconnect.call_args_list] == ["linear", "linear"]
+            assert ws_client.reconnect_counts["linear"] == 2
+        finally:
+            await ws_client.close()
+        assert ws_client._watchdog_task is None
+
+    @pytest.mark.asyncio
+    async def test_ticker_delta_merged_into_snapshot(self):
+        """delta тикера сливается с последним snapshot, callback получает полный тикер в loop"""
+        from src.api.bybit_websocket_client import BybitWebSocketClient
+
+        ws_client = BybitWebSocketClient("key", "secret", testnet=True)
+        await ws_client.connect()
+        received = []
+        ws_client.ticker_callbacks[("linear", "tickers.BTCUSDT")].append(
+            lambda symbol, ticker: received.append((symbol, ticker))
+        )
+
+        try:
+            ws_client._dispatch("linear", {
+                "topic": "tickers.BTCUSDT", "type": "snapshot",
+                "data": {"symbol": "BTCUSDT", "lastPrice": "100", "volume24h": "5"},
+            })
+            ws_client._dispatch("linear", {
+                "topic": "tickers.BTCUSDT", "type": "delta",
+                "data": {"symbol": "BTCUSDT", "lastPrice": "101"},
+            })
+            await asyncio.sleep(0)
+
+            assert [t["lastPrice"] for _, t in received] == ["100", "101"]
+            assert received[1] == ("BTCUSDT", {"symbol": "BTCUSDT", "lastPrice": "101", "volume24h": "5"})
+            assert received[0][1] is not received[1][1]
+        finally:
+            await ws_client.close()
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import hmac
+
+import pytest
+
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from src.api.bybit_http import BybitHTTP
+
+
+@pytest.mark.unit
+class TestBybitHTTP:
+    """Тесты async транспорта Bybit v5"""
+
+    def test_endpoints(self):
+        """Проверяем выбор домена по testnet/demo"""
+        assert BybitHTTP(testnet=True).endpoint == "https://api-testnet.bybit.com"
+        assert BybitHTTP(testnet=False).endpoint == "https://api.bybit.com"
+        assert BybitHTTP(testnet=False, demo=True).endpoint == "https://api-demo.bybit.com"
+        assert BybitHTTP(testnet=True, demo=True).endpoint == "https://api-demo-testnet.bybit.com"
+
+    def test_sign_matches_bybit_v5(self):
+        """Подпись: HMAC-SHA256(timestamp + api_key + recv_window + payload)"""
+        http = BybitHTTP(api_key="key", api_secret="secret", recv_window=5000)
+        payload = "category=linear&symbol=BTCUSDT"
+
+        expected = hmac.new(
+            b"secret",
+            f"1700000000000key5000{payload}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+
+        assert http._sign("1700000000000", payload) == expected
+
+    @pytest.mark.asyncio
+    async def test_public_methods_route_to_v5_paths(self):
+        """Проверяем маршрутизацию публичных методов"""
+        http = BybitHTTP()
+
+        with patch.object(BybitHTTP, "_request", AsyncMock(return_value={"retCode": 0})) as mock_request:
+            await http.get_tickers(category="spot", symbol="BTCUSDT")
+            mock_request.assert_awaited_once_with(
+                "GET", "/v5/market/tickers", {"category": "spot", "symbol": "BTCUSDT"}
+            )
+
+    @pytest.mark.asyncio
+    async def test_private_methods_are_signed(self):
+        """Приватные методы должны идти с auth=True"""
+        http = BybitHTTP(api_key="key", api_secret="secret")
+
+        with patch.object(BybitHTTP, "_request", AsyncMock(return_value={"retCode": 0})) as mock_request:
+            await http.place_order(category="linear", symbol="BTCUSDT", side="Buy")
+            args, kwargs = mock_request.call_args
+            assert args[:2] == ("POST", "/v5/order/create")
+            assert kwargs["auth"] is True
+
+    @pytest.mark.asyncio
+    async def test_request_acquires_bucket_by_path_category(self):
+        """Каждый запрос берёт токен из ведра своей категории"""
+        http = BybitHTTP()
+        http._buckets["market"] = AsyncMock()
+        http._session = Mock(closed=False)
+        http._session.request.side_effect = RuntimeError("stop")
+
+        with pytest.raises(RuntimeError):
+            await http._request("GET", "/v5/market/time")
+
+        http._buckets["market"].acquire.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_keepalive_pings_server_time_and_stops_on_close(self):
+        """Keep-alive пингует /v5/market/time и отменяется в close()"""
+        http = BybitHTTP()
+
+        with patch.object(BybitHTTP, "get_server_time", AsyncMock(return_value={"retCode": 0})) as mock_ping:
+            http.start_keepalive(interval=0)
+            for _ in range(3):
+                await asyncio.sleep(0)
+
+            assert mock_ping.await_count >= 1
+
+            await http.close()
+            assert http._keepalive_task is None
+
+    @pytest.mark.asyncio
+    async def test_prewarm_opens_connections_and_swallows_errors(self):
+        """prewarm шлёт N параллельных пингов и не падает на ошибке сети"""
+        http = BybitHTTP()
+
+        with patch.object(BybitHTTP, "get_server_time", AsyncMock(side_effect=TimeoutError())) as mock_ping:
+            await http.prewarm(connections=3)
+
+        assert mock_ping.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_response_pauses_bucket(self):
+        """429 ставит ведро категории на паузу по Retry-After"""
+        http = BybitHTTP()
+        bucket = http._buckets["market"] = Mock(acquire=AsyncMock())
+        resp = Mock(status=429, headers={"Retry-After": "3"})
+        resp.raise_for_status.side_effect = RuntimeError("429")
+        http._session = MagicMock(closed=False)
+        http._session.request.return_value.__aenter__.return_value = resp
+
+        with pytest.raises(RuntimeError):
+            await http._request("GET", "/v5/market/tickers")
+
+        bucket.penalize.assert_called_once_with(3.0)
+
+    @pytest.mark.asyncio
+    async def test_request_timeout_is_counted(self):
+        """Таймаут запроса увеличивает timeout_count и пробрасывается дальше"""
+        http = BybitHTTP()
+        http._session = Mock(closed=False)
+        http._session.request.side_effect = TimeoutError()
+
+        with pytest.raises(TimeoutError):
+            await http._request("GET", "/v5/market/time")
+
+        assert http.timeout_count == 1
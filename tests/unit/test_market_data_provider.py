@@ -0,0 +1,276 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from unittest.mock import AsyncMock, Mock, patch
+from src.api.bybit_client import BybitClient
+from src.api.common import ticker_to_kline
+from src.api.market_data_provider import MarketDataProvider, MultiMarketDataProvider
+
+
+def _ticker(price: str) -> dict:
+    return {"lastPrice": price, "highPrice24h": price, "lowPrice24h": price, "volume24h": "1"}
+
+
+def _strategy_config() -> SimpleNamespace:
+    signal = SimpleNamespace(index="BTCUSDT", frame="5s")
+    return SimpleNamespace(
+        name="MULTI-test",
+        trade_pairs=["WIFUSDT", "BTCUSDT"],
+        signals={"sig": signal},
+        get_market_category=lambda: "linear",
+    )
+
+
+def _pair_config() -> SimpleNamespace:
+    return SimpleNamespace(
+        name="PAIR-test",
+        dominant_pair="BTCUSDT",
+        target_pair="WIFUSDT",
+        timeframe="5s",
+        uses_websocket=lambda: False,
+        get_polling_interval_seconds=lambda: 5,
+        get_market_category=lambda: "linear",
+    )
+
+
+@pytest.mark.unit
+def test_ticker_to_kline_falls_back_to_last_price():
+    """Пустые и отсутствующие high/low берут last, volume — ноль"""
+    kline = ticker_to_kline({"lastPrice": "2.5", "highPrice24h": "", "volume24h": ""}, timestamp_ms=7)
+
+    assert (kline.timestamp, kline.open, kline.high, kline.low, kline.close, kline.volume) == (7, 2.5, 2.5, 2.5, 2.5, 0.0)
+    assert kline.confirm
+
+
+@pytest.mark.unit
+class TestMarketDataProvider:
+    """Тесты legacy провайдера данных (PairConfig)"""
+
+    @pytest.mark.asyncio
+    async def test_poll_tickers_requests_both_pairs_concurrently(self):
+        """Обе пары запрашиваются параллельно, ошибка одной не мешает другой"""
+        started: list[str] = []
+        both_started = asyncio.Event()
+
+        async def get_ticker(category: str, symbol: str) -> dict:
+            started.append(symbol)
+            if len(started) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            if symbol == "BTCUSDT":
+                raise RuntimeError("boom")
+            return _ticker("2")
+
+        provider = MarketDataProvider(_pair_config(), Mock(get_ticker=get_ticker), Mock())
+        dominant, target = AsyncMock(), AsyncMock()
+        provider.set_callbacks(dominant, target)
+
+        await provider._poll_tickers()
+
+        assert started == ["BTCUSDT", "WIFUSDT"]
+        dominant.assert_not_awaited()
+        target.assert_awaited_once()
+        assert target.await_args.args[0] == "WIFUSDT"
+        assert target.await_args.args[1].close == 2.0
+
+    @pytest.mark.asyncio
+    async def test_websocket_mode_awaits_both_subscriptions(self):
+        """subscribe_kline — корутина: обе подписки действительно выполняются"""
+        ws_client = Mock(subscribe_kline=AsyncMock(return_value=True))
+        provider = MarketDataProvider(_pair_config(), Mock(), ws_client)
+
+        await provider._start_websocket()
+
+        assert [c.kwargs["symbol"] for c in ws_client.subscribe_kline.await_args_list] == ["BTCUSDT", "WIFUSDT"]
+        assert ws_client.subscribe_kline.await_args_list[0].kwargs["callback"] == provider._ws_dominant_callback
+
+    @pytest.mark.asyncio
+    async def test_polling_loop_keeps_fixed_cadence(self):
+        """Первый опрос сразу, далее сон до следующего дедлайна, а не полный интервал после опроса"""
+        provider = MarketDataProvider(_pair_config(), Mock(), Mock())
+        loop = asyncio.get_running_loop()
+        clock = [100.0]
+        sleeps: list[float] = []
+
+        async def poll() -> None:
+            clock[0] += 2.0  # опрос занимает 2 секунды из 5
+            if len(sleeps) == 2:
+                provider.polling_active = False
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+            clock[0] += delay
+
+        provider._poll_tickers = poll
+        provider.polling_active = True
+        with patch.object(loop, "time", lambda: clock[0]), \
+             patch("src.api.market_data_provider.asyncio.sleep", fake_sleep):
+            await provider._polling_loop()
+
+        assert sleeps == [pytest.approx(3.0), pytest.approx(3.0), pytest.approx(3.0)]
+
+    @pytest.mark.asyncio
+    async def test_polling_errors_back_off_exponentially(self):
+        """Ошибки подряд удлиняют паузу, успешный опрос сбрасывает серию"""
+        provider = MarketDataProvider(_pair_config(), Mock(), Mock())
+        loop = asyncio.get_running_loop()
+        outcomes = [RuntimeError("a"), RuntimeError("b"), None, RuntimeError("c")]
+        sleeps: list[float] = []
+
+        async def poll() -> None:
+            outcome = outcomes.pop(0)
+            if not outcomes:
+                provider.polling_active = False
+            if outcome is not None:
+                raise outcome
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+
+        provider._poll_tickers = poll
+        provider.polling_active = True
+        with patch.object(loop, "time", lambda: 100.0), \
+             patch("src.api.bybit_client.random.uniform", return_value=1.0), \
+             patch("src.api.market_data_provider.asyncio.sleep", fake_sleep):
+            await provider._polling_loop()
+
+        # Пауза после ошибки, затем обычный сон до следующего дедлайна
+        assert sleeps == [0.25, 5.0, 0.5, 10.0, 15.0, 0.25, 20.0]
+
+
+@pytest.mark.unit
+class TestMultiMarketDataProvider:
+    """Тесты провайдера данных мультисигнальных стратегий"""
+
+    @pytest.mark.asyncio
+    async def test_poll_frame_data_uses_precomputed_symbols(self):
+        """Набор пар frame считается один раз и уходит одним batch запросом"""
+        rest_client = Mock(get_tickers_batch=AsyncMock(return_value={"BTCUSDT": {"lastPrice": "3"}}))
+        provider = MultiMarketDataProvider(_strategy_config(), rest_client, Mock())
+        callback = AsyncMock()
+        provider.set_callback(callback)
+        signal_configs = list(provider.polling_signals.values())
+
+        await provider._poll_frame_data("5s", signal_configs)
+        await provider._poll_frame_data("5s", signal_configs)
+
+        symbols = provider._frame_symbols["5s"]
+        assert sorted(symbols) == ["BTCUSDT", "WIFUSDT"]
+        for call in rest_client.get_tickers_batch.await_args_list:
+            assert call.kwargs == {"category": "linear", "symbols": symbols}
+        assert provider._kline_queue.qsize() == 2
+        callback.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_slow_callback_does_not_block_producer(self):
+        """Источник только ставит свечу в очередь, callback вызывает потребитель"""
+        release = asyncio.Event()
+        received: list[str] = []
+
+        async def slow_callback(symbol, kline) -> None:
+            await release.wait()
+            received.append(symbol)
+
+        rest_client = Mock(get_tickers_batch=AsyncMock(return_value={"BTCUSDT": {"lastPrice": "3"}}))
+        provider = MultiMarketDataProvider(_strategy_config(), rest_client, Mock())
+        provider.set_callback(slow_callback)
+        consumer = asyncio.create_task(provider._consume())
+        signal_configs = list(provider.polling_signals.values())
+
+        await asyncio.wait_for(provider._poll_frame_data("5s", signal_configs), timeout=1)
+        await asyncio.wait_for(provider._poll_frame_data("5s", signal_configs), timeout=1)
+        assert received == []
+
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        consumer.cancel()
+        assert received == ["BTCUSDT", "BTCUSDT"]
+
+    @pytest.mark.asyncio
+    async def test_websocket_subscriptions_use_single_bulk_call(self):
+        """Уникальные пары symbol+interval уходят в ws_client одним bulk вызовом"""
+        config = _strategy_config()
+        config.signals = {
+            "a": SimpleNamespace(index="BTCUSDT", frame="1"),
+            "b": SimpleNamespace(index="ETHUSDT", frame="1"),
+        }
+        ws_client = Mock(subscribe_klines_bulk=AsyncMock(return_value={("BTCUSDT", "1")}))
+        provider = MultiMarketDataProvider(config, Mock(), ws_client)
+
+        await provider._start_websocket_subscriptions()
+
+        ws_client.subscribe_klines_bulk.assert_awaited_once_with(
+            category="linear",
+            pairs=[("BTCUSDT", "1"), ("ETHUSDT", "1"), ("WIFUSDT", "1")],
+            callback=provider._ws_callback,
+        )
+
+    def test_full_queue_drops_oldest_kline(self):
+        """Переполненная очередь вытесняет самую старую свечу"""
+        provider = MultiMarketDataProvider(_strategy_config(), Mock(), Mock())
+        provider._kline_queue = asyncio.Queue(maxsize=2)
+        klines = [Mock(name=f"k{i}") for i in range(3)]
+
+        for i, kline in enumerate(klines):
+            provider._enqueue(f"S{i}", kline)
+
+        assert provider.dropped_klines == 1
+        assert [provider._kline_queue.get_nowait()[0] for _ in range(2)] == ["S1", "S2"]
+
+    @pytest.mark.asyncio
+    async def test_polling_loop_schedules_frames_by_nearest_deadline(self):
+        """Один цикл опрашивает все frame, каждый по своему дедлайну"""
+        provider = MultiMarketDataProvider(_strategy_config(), Mock(), Mock())
+        loop = asyncio.get_running_loop()
+        clock = [100.0]
+        polls: list[tuple[float, str]] = []
+
+        async def poll(frame, signal_configs) -> None:
+            polls.append((clock[0], frame))
+            if len(polls) == 5:
+                provider.polling_active = False
+
+        async def fake_sleep(delay: float) -> None:
+            clock[0] += delay
+
+        provider._poll_frame_data = poll
+        provider.polling_active = True
+        with patch.object(loop, "time", lambda: clock[0]), \
+             patch("src.api.market_data_provider.asyncio.sleep", fake_sleep):
+            await provider._polling_loop({"2s": [], "1s": []})
+
+        assert polls == [(100.0, "1s"), (100.0, "2s"), (101.0, "1s"), (102.0, "1s"), (102.0, "2s")]
+
+    @pytest.mark.asyncio
+    @patch('src.api.bybit_client.BybitHTTP')
+    async def test_rest_failure_reaches_polling_backoff(self, mock_http):
+        """Ошибка REST в get_tickers_batch не глотается: цикл уходит в растущий backoff"""
+        mock_session = AsyncMock()
+        mock_session.get_tickers.side_effect = ConnectionError("network down")
+        mock_http.return_value = mock_session
+        rest_client = BybitClient("key", "secret", testnet=True)
+        provider = MultiMarketDataProvider(_strategy_config(), rest_client, Mock())
+        provider._frame_symbols["5s"] = provider._collect_symbols(list(provider.polling_signals.values()))
+        loop = asyncio.get_running_loop()
+        sleeps: list[float] = []
+
+        async def fake_sleep(delay: float) -> None:
+            sleeps.append(delay)
+            if len(sleeps) == 4:
+                provider.polling_active = False
+
+        provider.polling_active = True
+        try:
+            with patch.object(loop, "time", lambda: 100.0), \
+                 patch("src.api.bybit_client.random.uniform", return_value=1.0), \
+                 patch("src.api.market_data_provider.asyncio.sleep", fake_sleep):
+                await provider._polling_loop({"5s": list(provider.polling_signals.values())})
+        finally:
+            await rest_client.close()
+
+        # Пауза после ошибки, сон до дедлайна, пауза вдвое длиннее, ...
+        assert sleeps[:5] == [0.25, 5.0, 0.5, 10.0, 1.0]
+        assert mock_session.get_tickers.await_count == 3
@@ -0,0 +1,45 @@
+import pytest
+
+from unittest.mock import AsyncMock, patch
+from src.api.rate_limiter import TokenBucket
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Тесты token-bucket ограничителя"""
+
+    @pytest.mark.asyncio
+    async def test_acquire_within_capacity_does_not_sleep(self):
+        """Пока есть токены — ожидания нет"""
+        bucket = TokenBucket(rate=10, cap=5)
+
+        with patch("src.api.rate_limiter.asyncio.sleep", AsyncMock()) as mock_sleep:
+            for _ in range(5):
+                await bucket.acquire()
+
+        mock_sleep.assert_not_awaited()
+        assert bucket.tokens < 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_sleeps_for_missing_tokens(self):
+        """При нехватке токенов ждём (cost - tokens) / rate"""
+        bucket = TokenBucket(rate=10, cap=2)
+        bucket.tokens = 0.0
+
+        with patch("src.api.rate_limiter.time.monotonic", return_value=bucket.last), \
+             patch("src.api.rate_limiter.asyncio.sleep", AsyncMock()) as mock_sleep:
+            await bucket.acquire(cost=2)
+
+        mock_sleep.assert_awaited_once_with(pytest.approx(0.2))
+
+    @pytest.mark.asyncio
+    async def test_penalize_delays_next_acquire(self):
+        """После 429 следующий запрос ждёт паузу, даже если ведро было полным"""
+        bucket = TokenBucket(rate=10, cap=5)
+
+        with patch("src.api.rate_limiter.time.monotonic", return_value=bucket.last), \
+             patch("src.api.rate_limiter.asyncio.sleep", AsyncMock()) as mock_sleep:
+            bucket.penalize(2.0)
+            await bucket.acquire()
+
+        mock_sleep.assert_awaited_once_with(pytest.approx(2.1))